@@ -13,15 +13,49 @@ import bpy, os
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import time
+from contextlib import contextmanager
+
+# Startup profiling
+# Set ZANATOMY_PROFILE_STARTUP=1 to print the time spent in each phase of
+# register()/load_post/only_once once the atlas is interactive.
+
+PROFILE_STARTUP = os.environ.get('ZANATOMY_PROFILE_STARTUP') == '1'
+startup_timings = []
+_import_start = time.perf_counter()
+
+@contextmanager
+def startup_phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if PROFILE_STARTUP:
+            startup_timings.append((name, time.perf_counter() - start))
+
+def report_startup_timings(since=None):
+    if not PROFILE_STARTUP or not startup_timings:
+        return
+    print("Z-Anatomy startup timings:")
+    for name, seconds in startup_timings:
+        print(f"  {name:<32}{seconds*1000:9.1f} ms")
+    if since is not None:
+        print(f"  {'time to interactive':<32}{(time.perf_counter() - since)*1000:9.1f} ms")
+    startup_timings.clear()
+
 import bpy
 from mathutils import Vector
 import mathutils
-import requests, json
+import json
+from collections import OrderedDict
 import urllib.parse
 import os.path
 from bpy_extras.object_utils import object_data_add
 import re
 
+if PROFILE_STARTUP:
+    startup_timings.append(("module imports", time.perf_counter() - _import_start))
+
 label_elements = {"-txt", ".t", ".j"}
 
 def family_all(object):
@@ -606,6 +640,9 @@ class OBJECT_OT_make_label(bpy.types.Operator):
         hm.object = active_object
         hm.vertex_indices_set([1])
         
+        # created after the one-time migration in only_once()
+        write_object_props([font_object, line_object])
+        
         # Add Skin modifier
         # line_object.modifiers.new(name='Skin', type='SKIN')
         # for v in line_object.data.skin_vertices[0].data:
@@ -618,6 +655,132 @@ class OBJECT_OT_make_label(bpy.types.Operator):
         font_object.hide_set(False)
         return {"FINISHED"}
 
+class OBJECT_OT_bake_label_overlay(bpy.types.Operator):
+    """Bake .t/.g labels and their .j lines into the overlay label table"""
+    bl_idname = "object.bake_label_overlay"
+    bl_label = "Bake Label Overlay"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    remove_objects: bpy.props.BoolProperty(default=False, name="Remove label objects")
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        # leader lines disabled by OVERLAY mode are not evaluated, their hooks would be missing
+        disable_label_objects(False)
+        depsgraph = context.evaluated_depsgraph_get()
+        # lines of layers merged by LAYERS_OT_merge_leader_lines, by label data name
+        merged_lines = {row[0]: row for rows, _ in get_leader_lines().values() for row in rows}
+        rows = []
+        baked = []
+        for label in [ob for ob in bpy.data.objects if ob.type == 'FONT' and re.search(r"(\.t)|(\.g)$", ob.name)]:
+            line = next((c for c in label.children if c.name.endswith('.j')), None)
+            hook = next((m for m in line.modifiers if m.type == 'HOOK'), None) if line else None
+            merged = merged_lines.get(label.data.name) if line is None else None
+            owner = hook.object if hook and hook.object else label_owner(merged[2]) if merged else label.parent
+            if owner is None or owner.data is None:
+                if not label.name.endswith('.g'):
+                    continue
+                # group labels often hang off an empty: keep them in world space, without owner
+                owner = None
+
+            to_local = owner.matrix_world.inverted() if owner else mathutils.Matrix()
+            text_co = label.matrix_world.translation
+            if line and len(line.data.vertices) == 2:
+                verts = line.evaluated_get(depsgraph).data.vertices
+                head = line.matrix_world @ verts[0].co
+                anchor = line.matrix_world @ verts[1].co
+            elif merged:
+                head = label.matrix_world @ merged[1]
+                anchor = owner.matrix_world @ merged[3]
+            else:
+                head = anchor = text_co
+
+            col = label.users_collection[0] if label.users_collection else None
+            rows.append({
+                "owner": owner.data.name if owner else "",
+                "collection": col.get('English', col.name) if col else "",
+                "text": label.data.body,
+                "group": label.name.endswith('.g'),
+                "co": [round(v, 5) for p in (to_local @ text_co, to_local @ head, to_local @ anchor) for v in p],
+            })
+            baked.append(label)
+
+        text = bpy.data.texts.get(LABEL_TABLE_TEXT) or bpy.data.texts.new(LABEL_TABLE_TEXT)
+        text.clear()
+        text.write(json.dumps(rows, separators=(',', ':')))
+        label_table.clear()
+
+        if self.remove_objects:
+            for ob in {ob for label in baked for ob in family(label)}:
+                bpy.data.objects.remove(ob, do_unlink=True)
+            # merged leader lines of the removed labels
+            for ob in [ob for ob in bpy.data.objects if 'leader_lines' in ob]:
+                bpy.data.objects.remove(ob, do_unlink=True)
+            leader_lines.clear()
+        elif context.scene.zanatomy.label_mode == 'OVERLAY':
+            disable_label_objects(True)
+
+        self.report(type={"INFO"}, message=f"Baked {len(rows)} labels.")
+        return {"FINISHED"}
+
+class LAYERS_OT_merge_leader_lines(bpy.types.Operator):
+    """Replace the hooked .j line objects of every layer with one leader-line mesh per layer"""
+    bl_idname = "layer.merge_leader_lines"
+    bl_label = "Merge Leader Lines"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT'
+
+    def execute(self, context):
+        depsgraph = context.evaluated_depsgraph_get()
+        merged = 0
+        for layer in context.scene.collection.children:
+            rows = []
+            lines = []
+            for line in (ob for ob in layer.all_objects if ob.type == 'MESH' and ob.name.endswith('.j')):
+                hook = next((m for m in line.modifiers if m.type == 'HOOK'), None)
+                label = line.parent
+                if hook is None or hook.object is None or hook.object.data is None or label is None or label.data is None:
+                    continue
+                verts = line.evaluated_get(depsgraph).data.vertices
+                if len(verts) != 2:
+                    continue
+                head = line.matrix_world @ verts[0].co
+                anchor = line.matrix_world @ verts[1].co
+                rows.append([
+                    label.data.name, list(label.matrix_world.inverted() @ head),
+                    hook.object.data.name, list(hook.object.matrix_world.inverted() @ anchor),
+                ])
+                lines.append(line)
+            if not rows:
+                continue
+
+            name = f"{layer.name} leader lines"
+            mesh = bpy.data.meshes.new(name)
+            mesh.from_pydata([(0, 0, 0)] * 2 * len(rows), [(2*i, 2*i+1) for i in range(len(rows))], [])
+            merged_object = bpy.data.objects.new(name, mesh)
+            merged_object.hide_select = True
+            merged_object.show_wire = True
+            merged_object['leader_lines'] = json.dumps(rows, separators=(',', ':'))
+            layer.objects.link(merged_object)
+            write_object_props([merged_object])
+
+            for line in lines:
+                bpy.data.objects.remove(line, do_unlink=True)
+            merged += len(rows)
+
+        # merged meshes only follow their labels in MERGED mode (see leader_lines_depsgraph_update)
+        context.scene.zanatomy.label_mode = 'MERGED'
+        leader_lines.clear()
+        update_leader_lines()
+        self.report(type={"INFO"}, message=f"Merged {merged} leader lines.")
+        return {"FINISHED"}
+
 class TEXT_OT_wiki_download(bpy.types.Operator):
     """Wiki download"""
     bl_idname = "text.wiki_download"
@@ -625,6 +788,9 @@ class TEXT_OT_wiki_download(bpy.types.Operator):
     bl_options = {'REGISTER'}
 
     def execute(self, context):
+        # imported here, it is only needed by this operator and slow to import at startup
+        import requests
+
         # 0. setup phrase list
         if not "Wiki Phrases" in bpy.data.texts:
             self.report(type={"ERROR"}, message="Create 'Wiki Phrases' text file.")
@@ -734,10 +900,12 @@ def z_anatomy_load_post(scene=None):
             if area.type == 'VIEW_3D':
                 area3D = area
                 viewport_orientation = area3D.spaces[0].region_3d.view_rotation
+                # overlay labels always face the viewer, no billboarding needed
+                overlay = bpy.context.scene.zanatomy.label_mode == 'OVERLAY'
 
                 # for obj in bpy.data.objects:
-                for obj in bpy.context.visible_objects:
-                    if '.t' in obj.name or obj.name.endswith('...'):
+                for obj in refresh_objects() if overlay else bpy.context.visible_objects:
+                    if ('.t' in obj.name and not overlay) or obj.name.endswith('...'):
                         if obj.rotation_quaternion != viewport_orientation:
                             if obj.rotation_mode != 'QUATERNION':
                                 obj.rotation_mode = 'QUATERNION'
@@ -749,6 +917,9 @@ def z_anatomy_load_post(scene=None):
                         obj.hide_viewport = False
         return 0.0165
 
+    label_table.clear()
+    leader_lines.clear()
+    refresh_cache.clear()
     bpy.app.timers.register(refresh, first_interval=0.01)
     
     bpy.msgbus.subscribe_rna(
@@ -766,26 +937,94 @@ def z_anatomy_load_post(scene=None):
     )
 
     # use timer to get correct context after registration
+    startup_info["load_post"] = time.perf_counter()
     bpy.app.timers.register(only_once, first_interval=0.01)
 
+# Bump when write_object_props() starts writing new props, so that saved
+# files are migrated once more on their next load. Objects created later
+# (labels, merged leader lines, appended layers) get their props where they
+# are created.
+OBJECT_PROPS_VERSION = 1
+startup_info = {"load_post": None}
+
+def write_object_props(objects):
+    """Write the shader driving props that the ZAnatomyProps update functions keep in sync"""
+    zanatomy = bpy.context.scene.zanatomy
+    for ob in objects:
+        if ob.type in {'MESH', 'CURVE'} and ob.users_collection:
+            ob['key_color'] = zanatomy.key_color
+        ob['comic_shader'] = zanatomy.comic_shader
+
+# Description texts
+# Z-Anatomy-lite.blend links the description of the active object from
+# Z-Anatomy.blend when it is first shown instead of linking every text block
+# at startup. At most DESCRIPTION_CACHE_SIZE descriptions stay linked.
+
+DESCRIPTION_CACHE_SIZE = 64
+DESCRIPTION_PREFETCH = 8
+EAGER_TEXTS = ['Translations']
+description_library = {"path": None, "names": set()}
+description_cache = OrderedDict()
+
+def fetch_descriptions(names):
+    """Link missing description texts from the main blend and evict the least recently used"""
+    if description_library["path"] is None:
+        return
+    missing = []
+    for name in names:
+        if name in description_cache:
+            description_cache.move_to_end(name)
+        elif name in description_library["names"] and name not in bpy.data.texts:
+            missing.append(name)
+
+    if missing:
+        with bpy.data.libraries.load(description_library["path"], link=True, relative=True) as (data_from, data_to):
+            data_to.texts = missing
+        for text in data_to.texts:
+            if text is not None:
+                description_cache[text.name] = None
+
+    while len(description_cache) > DESCRIPTION_CACHE_SIZE:
+        name, _ = description_cache.popitem(last=False)
+        text = bpy.data.texts.get(name)
+        if text is not None:
+            bpy.data.texts.remove(text)
+
+def prefetch_description_neighbours():
+    """Timer: link descriptions of the active object's siblings and children while idle"""
+    active_object = bpy.context.active_object
+    if active_object is None:
+        return None
+    siblings = active_object.parent.children if active_object.parent else ()
+    neighbours = (ob for ob in siblings + active_object.children
+                  if ob.data and not any(x in ob.name for x in label_elements))
+    names = []
+    for ob in neighbours:
+        name = clean_name(ob.data.name)[0]
+        if name not in names:
+            names.append(name)
+    fetch_descriptions(names[:DESCRIPTION_PREFETCH])
+    return None
+
 layer_collections = []
 def only_once():
-    try:
-        if bpy.ops.view3d.stored_views_initialize.poll():
-            bpy.ops.view3d.stored_views_initialize()
-    except Exception as e:
-        print(e)
-    
-    for ob in [c for col in bpy.data.collections for c in col.all_objects if c.type == 'MESH']:
-        ob['key_color'] = bpy.context.scene.zanatomy.key_color
-        
-    for ob in [c for col in bpy.data.collections for c in col.all_objects if c.type == 'CURVE']:
-        ob['key_color'] = bpy.context.scene.zanatomy.key_color
+    with startup_phase("stored views"):
+        try:
+            if bpy.ops.view3d.stored_views_initialize.poll():
+                bpy.ops.view3d.stored_views_initialize()
+        except Exception as e:
+            print(e)
     
-    for ob in bpy.data.objects:
-        ob['comic_shader'] = bpy.context.scene.zanatomy.comic_shader
+    # one-time migration: the update functions keep these props in sync afterwards
+    scene = bpy.context.scene
+    if scene.get('zanatomy_object_props', 0) < OBJECT_PROPS_VERSION:
+        with startup_phase("object props migration"):
+            write_object_props(bpy.data.objects)
+            scene['zanatomy_object_props'] = OBJECT_PROPS_VERSION
     
     # Layers for lite version
+    description_library["path"] = None
+    description_cache.clear()
     blend_path = bpy.data.filepath
     blend_name = bpy.path.basename(blend_path)
     main_blend = os.path.join(os.path.dirname(blend_path), 'Z-Anatomy.blend')
@@ -793,21 +1032,23 @@ def only_once():
     if blend_name == 'Z-Anatomy-lite.blend':
         # remove linked texts blocks from lite blend
         DO_NOT_DELETE = ['z-anatomy.py']
-        txt_list = [text.name for text in bpy.data.texts if text.name not in DO_NOT_DELETE]
+        with startup_phase("lite: remove local texts"):
+            txt_list = [text.name for text in bpy.data.texts if text.name not in DO_NOT_DELETE]
 
-        for text_name in txt_list:
-            text = bpy.data.texts[text_name]
-            bpy.data.texts.remove(text)
+            for text_name in txt_list:
+                text = bpy.data.texts[text_name]
+                bpy.data.texts.remove(text)
 
-        layer_collections = ['.Skeletal system', '.Muscular insertions', '.Joints', '.Muscular system', '.Cardiovascular system', '.Lymphoid organs', '.Nervous system & Sense organs', '.Visceral systems', '.Regions of human body', '.Reference lines, planes & movements']
-        with bpy.data.libraries.load(main_blend, relative=True) as (data_from, data_to):
-            # layer_collections = [col_name for col_name in data_from.collections if col_name[0].isdigit()]
-            # layer_collections.sort()
-            
-            # layer_collections = list(map(lambda x: re.split('\d+:', x)[1], layer_collections))
+        # written by scripts/build-z-anatomy-lite.py, hand-made lite files fall back to the fixed list
+        layer_collections = list(bpy.context.scene.get('zanatomy_layers', ['.Skeletal system', '.Muscular insertions', '.Joints', '.Muscular system', '.Cardiovascular system', '.Lymphoid organs', '.Nervous system & Sense organs', '.Visceral systems', '.Regions of human body', '.Reference lines, planes & movements']))
+        # descriptions are linked on demand by msgbus_callback, see fetch_descriptions()
+        description_library["path"] = main_blend
+        with startup_phase("lite: link texts"):
+            with bpy.data.libraries.load(main_blend, link=True, relative=True) as (data_from, data_to):
+                description_library["names"] = set(data_from.texts) - {"z-anatomy.py"}
+                data_to.texts = [txt_name for txt_name in EAGER_TEXTS if txt_name in data_from.texts]
 
-            files = [{'name': txt_name} for txt_name in data_from.texts if txt_name != "z-anatomy.py"]
-        bpy.ops.wm.append(directory=main_blend+"/Text/", files=files, do_reuse_local_id=True, link=True)
+    report_startup_timings(since=startup_info["load_post"])
 
 # Selection to Text in editor
 
@@ -857,11 +1098,20 @@ def msgbus_callback(*args):
             text_editor_area = area
             break
     
+    if text_editor_area and description_library["path"]:
+        fetch_descriptions([basename])
+        if bpy.app.timers.is_registered(prefetch_description_neighbours):
+            bpy.app.timers.unregister(prefetch_description_neighbours)
+        bpy.app.timers.register(prefetch_description_neighbours, first_interval=0.5)
+
     if text_editor_area and basename in bpy.data.texts:
         text_editor_area.spaces[0].text = bpy.data.texts[basename]
         text_editor_area.spaces[0].top = 0
         text_editor_area.spaces[0].text.select_set(0, 0, 0, 0)
 
+    # overlay labels are picked per frame in draw_label_overlay
+    if bpy.context.scene.zanatomy.label_mode == 'OVERLAY':
+        return
 
     # only label of visible object ought to be visible
 
@@ -907,6 +1157,9 @@ def msgbus_callback(*args):
             for child in ob.children:
                 child.hide_set(True)
     
+    if bpy.context.scene.zanatomy.label_mode == 'MERGED':
+        update_leader_lines()
+
     if active_object.name.endswith('.g'):
         bpy.ops.object.select_grouped('INVOKE_DEFAULT', type='CHILDREN_RECURSIVE')
         active_object.select_set(True)
@@ -937,6 +1190,9 @@ class ZANATOMY_PT_labels(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
         layout.prop(context.scene.zanatomy, "enable_group_labels")
+        layout.prop(context.scene.zanatomy, "label_mode", expand=True)
+        layout.operator(OBJECT_OT_bake_label_overlay.bl_idname)
+        layout.operator(LAYERS_OT_merge_leader_lines.bl_idname)
 
 class ZANATOMY_PT_Xsection(bpy.types.Panel):
     bl_space_type = 'VIEW_3D'
@@ -1103,8 +1359,12 @@ class LAYERS_OT_add_layer(bpy.types.Operator):
         for collection in data_to.collections:
            if collection is not None:
                 context.scene.collection.children.link(collection)
+                write_object_props(collection.all_objects)
         
-        context.view_layer.objects.active = collection.objects[0]
+        layer_index = json.loads(context.scene.get('zanatomy_layer_index', '{}')).get(self.collection, {})
+        context.view_layer.objects.active = bpy.data.objects.get(layer_index.get("active", "")) or collection.objects[0]
+        label_table.clear()
+        leader_lines.clear()
         msgbus_callback()
 
         # relink cross section planes
@@ -1205,6 +1465,22 @@ class OBJECT_OT_key_color(bpy.types.Operator):
 
 class ZAnatomyProps(bpy.types.PropertyGroup):
     enable_group_labels: bpy.props.BoolProperty(default=True, name="Enable Group Labels", update=lambda self, context: label_group_checkbox_update())
+    def label_mode_func(self, context):
+        label_table.clear()
+        leader_lines.clear()
+        disable_label_objects(self.label_mode == 'OVERLAY')
+        if self.label_mode == 'MERGED':
+            update_leader_lines()
+        if context.area:
+            context.area.tag_redraw()
+    label_mode: bpy.props.EnumProperty(items=[
+        ("OBJECTS", "Objects", "Labels are FONT objects with hooked leader lines"),
+        ("OVERLAY", "Overlay", "Labels are drawn from the baked label table"),
+        ("MERGED", "Merged", "Labels are FONT objects sharing one leader-line mesh per layer"),
+        ],
+        default='OBJECTS',
+        name="Label Mode",
+        update=label_mode_func)
     def key_color_func(self, context):
         if '.Muscular system' in bpy.data.collections:
             var = self.key_color
@@ -1296,6 +1572,8 @@ classes = (
     OBJECT_OT_hide_view_clear_wrapper,
     TEXT_OT_wiki_download,
     OBJECT_OT_make_label,
+    OBJECT_OT_bake_label_overlay,
+    LAYERS_OT_merge_leader_lines,
     OBJECT_OT_label_delta,
     OBJECT_OT_change_label_wrapper,
     OBJECT_OT_translate_atlas,
@@ -1316,11 +1594,183 @@ classes = (
 )
 
 import blf
+import gpu
+from gpu_extras.batch import batch_for_shader
+from bpy_extras.view3d_utils import location_3d_to_region_2d
 
 font_info = {
     "handler": None,
 }
 
+# Label overlay
+# Labels baked by OBJECT_OT_bake_label_overlay are drawn here instead of as
+# FONT/.j objects. Rows hold (text, text_co, head, anchor, owner) with the
+# coordinates in the owner's local space, so they follow the anatomy element.
+
+LABEL_TABLE_TEXT = "Label Table"
+label_table = {}
+
+def get_label_table():
+    if not label_table:
+        label_table["owners"] = {}
+        label_table["groups"] = {}
+        text = bpy.data.texts.get(LABEL_TABLE_TEXT)
+        for row in json.loads(text.as_string()) if text else []:
+            co = row["co"]
+            entry = (row["text"], Vector(co[0:3]), Vector(co[3:6]), Vector(co[6:9]), row["owner"])
+            label_table["owners"].setdefault(row["owner"], []).append(entry)
+            if row["group"]:
+                label_table["groups"].setdefault(row["collection"], []).append(entry)
+    return label_table
+
+def label_owner(data_name):
+    """Object using data_name, looked up through a data name -> object name map"""
+    objects = label_table.setdefault("objects", {})
+    ob = bpy.data.objects.get(objects.get(data_name) or "")
+    if ob is None or ob.data is None or ob.data.name != data_name:
+        if data_name in objects and objects[data_name] is None:
+            return None
+        # renamed (translated) or not seen yet: rebuild the map once
+        objects.update({ob.data.name: ob.name for ob in bpy.data.objects if ob.data})
+        objects.setdefault(data_name, None)
+        ob = bpy.data.objects.get(objects[data_name] or "")
+    return ob
+
+def label_objects():
+    """FONT labels (.t/.g), their .j leader lines and the merged leader-line meshes"""
+    labels = [ob for ob in bpy.data.objects if ob.type == 'FONT' and re.search(r"(\.t)|(\.g)$", ob.name)]
+    merged = [ob for ob in bpy.data.objects if 'leader_lines' in ob]
+    return labels + [c for label in labels for c in label.children if c.name.endswith('.j')] + merged
+
+def disable_label_objects(disabled):
+    """Take the label objects out of the viewport (and its depsgraph) while the
+    overlay draws them, and bring back only those disabled here"""
+    for ob in label_objects():
+        if disabled and not ob.hide_viewport:
+            ob.hide_viewport = True
+            ob['overlay_hidden'] = True
+        elif not disabled and ob.get('overlay_hidden'):
+            ob.hide_viewport = False
+            del ob['overlay_hidden']
+
+# The refresh timer runs at 60 Hz; in OVERLAY mode it only needs the '...' and
+# always_show objects, listed once per change in the number of objects
+refresh_cache = {}
+
+def refresh_objects():
+    if refresh_cache.get("count") != len(bpy.data.objects):
+        refresh_cache["count"] = len(bpy.data.objects)
+        refresh_cache["names"] = [ob.name for ob in bpy.data.objects
+                                  if ob.name.endswith('...') or 'always_show' in ob.name]
+    objects = (bpy.data.objects.get(name) for name in refresh_cache["names"])
+    return [ob for ob in objects if ob is not None and ob.visible_get()]
+
+def label_overlay_rows(context):
+    active_object = context.object
+    table = get_label_table()
+    rows = list(table["owners"].get(active_object.data.name, ())) if active_object.data else []
+
+    if context.scene.zanatomy.enable_group_labels and active_object.users_collection:
+        col = active_object.users_collection[0]
+        rows += [r for r in table["groups"].get(col.get('English', col.name), ()) if r not in rows]
+    return rows
+
+def draw_label_overlay(context):
+    region, rv3d = context.region, context.region_data
+    if rv3d is None:
+        return
+
+    font_size = 12
+    blf.size(0, font_size, 72)
+
+    placed = []
+    lines = []
+    texts = []
+    for text, text_co, head, anchor, owner_name in label_overlay_rows(context):
+        # group labels without owner are stored in world space
+        owner = label_owner(owner_name) if owner_name else None
+        if owner_name and (owner is None or not owner.visible_get()):
+            continue
+        mw = owner.matrix_world if owner else mathutils.Matrix()
+        text_2d = location_3d_to_region_2d(region, rv3d, mw @ text_co)
+        anchor_2d = location_3d_to_region_2d(region, rv3d, mw @ anchor)
+        # screen-space culling
+        if text_2d is None or anchor_2d is None:
+            continue
+        if not (0 <= text_2d.x <= region.width and 0 <= text_2d.y <= region.height):
+            continue
+
+        # declutter: first come, first placed (active object's rows come first)
+        w, h = blf.dimensions(0, text)
+        rect = (text_2d.x - w/2, text_2d.y, text_2d.x + w/2, text_2d.y + h)
+        if any(rect[0] < r[2] and r[0] < rect[2] and rect[1] < r[3] and r[1] < rect[3] for r in placed):
+            continue
+        placed.append(rect)
+
+        head_2d = location_3d_to_region_2d(region, rv3d, mw @ head) or text_2d
+        lines += [head_2d, anchor_2d]
+        texts.append((rect[0], rect[1], text))
+
+    if lines:
+        shader = font_info.get("shader")
+        if shader is None:
+            try:
+                shader = font_info["shader"] = gpu.shader.from_builtin('UNIFORM_COLOR')
+            except ValueError:
+                shader = font_info["shader"] = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+        batch = batch_for_shader(shader, 'LINES', {"pos": [tuple(p) for p in lines]})
+        shader.bind()
+        shader.uniform_float("color", (1.0, 1.0, 1.0, 0.8))
+        batch.draw(shader)
+
+    blf.color(0, 1.0, 1.0, 1.0, 1.0)
+    for x, y, text in texts:
+        blf.position(0, x, y, 0)
+        blf.draw(0, text)
+
+# Merged leader lines
+# LAYERS_OT_merge_leader_lines stores, per layer mesh, rows of
+# [label data, head in label space, anchor data, anchor in anchor space].
+# Endpoints are rewritten in bulk only when a label or anchor moves.
+
+leader_lines = {}
+
+def get_leader_lines():
+    if not leader_lines:
+        for ob in bpy.data.objects:
+            if 'leader_lines' in ob and ob.type == 'MESH':
+                rows = [(label, Vector(head), anchor, Vector(anchor_co)) for label, head, anchor, anchor_co in json.loads(ob['leader_lines'])]
+                leader_lines[ob.name] = (rows, {name for row in rows for name in (row[0], row[2])})
+    return leader_lines
+
+def update_leader_lines(updated=None):
+    """Rewrite merged line endpoints; only meshes tracking a data name in updated when given"""
+    for name, (rows, tracked) in get_leader_lines().items():
+        merged_object = bpy.data.objects.get(name)
+        if merged_object is None or (updated is not None and tracked.isdisjoint(updated)):
+            continue
+        to_local = merged_object.matrix_world.inverted()
+        co = []
+        for label_name, head, anchor_name, anchor_co in rows:
+            label, anchor = label_owner(label_name), label_owner(anchor_name)
+            if label is None or anchor is None or not label.visible_get():
+                # hidden labels collapse their line to a point on the anchor
+                p = to_local @ (anchor.matrix_world @ anchor_co) if anchor else Vector()
+                co += [*p, *p]
+            else:
+                co += [*(to_local @ (label.matrix_world @ head)), *(to_local @ (anchor.matrix_world @ anchor_co))]
+        merged_object.data.vertices.foreach_set('co', co)
+        merged_object.data.update()
+
+@persistent
+def leader_lines_depsgraph_update(scene, depsgraph):
+    if not hasattr(scene, 'zanatomy') or scene.zanatomy.label_mode != 'MERGED':
+        return
+    updated = {u.id.data.name for u in depsgraph.updates
+               if u.is_updated_transform and isinstance(u.id, bpy.types.Object) and u.id.data}
+    if updated:
+        update_leader_lines(updated)
+
 def draw_callback_px(self, context):
     context = bpy.context
     if not hasattr(context, 'area') or not context.object: return
@@ -1331,6 +1781,9 @@ def draw_callback_px(self, context):
     blf.position(0, 55, context.area.height-70 - font_size, 0)
     blf.draw(0, f'{clean_name(context.object.name)[0]}')
 
+    if hasattr(context.scene, 'zanatomy') and context.scene.zanatomy.label_mode == 'OVERLAY':
+        draw_label_overlay(context)
+
 def register_keymaps():
     kc = bpy.context.window_manager.keyconfigs
     areas = 'Window', 'Text', 'Object Mode', '3D View'
@@ -1523,9 +1976,12 @@ def register_keymaps():
 
 def register():
     print("Registering to Change Defaults 3")
-    register_keymaps()
-    z_anatomy_load_post()
+    with startup_phase("register keymaps"):
+        register_keymaps()
+    with startup_phase("load_post"):
+        z_anatomy_load_post()
     bpy.app.handlers.load_post.append(z_anatomy_load_post)
+    bpy.app.handlers.depsgraph_update_post.append(leader_lines_depsgraph_update)
     for c in classes:
         bpy.utils.register_class(c)
     bpy.types.Scene.zanatomy = bpy.props.PointerProperty(type=ZAnatomyProps)
@@ -1543,6 +1999,7 @@ def unregister():
     remove_shortkeys()
 
     bpy.app.handlers.load_post.remove(z_anatomy_load_post)
+    bpy.app.handlers.depsgraph_update_post.remove(leader_lines_depsgraph_update)
     bpy.msgbus.clear_by_owner(owner)
     bpy.types.SpaceView3D.draw_handler_remove(font_info["handler"], 'WINDOW')
 
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Warm Blender worker pool for the Z-Anatomy pipeline scripts
+Usage:
+  python3 scripts/blender-worker-pool.py serve [--blend <file>] [--workers N] [--port 8765]
+  python3 scripts/blender-worker-pool.py submit <job|script.py> [--reset revert] [-- script options]
+  python3 scripts/blender-worker-pool.py status
+
+serve starts N headless Blender processes with the .blend loaded once and
+accepts jobs on a local socket (127.0.0.1 only, jobs run arbitrary scripts).
+A job runs a pipeline script in an idle worker as if it were launched with
+blender --background <blend> --python <script> -- <options>. Afterwards the worker
+reloads the file (revert), or, for the read-only inspect and ontology jobs,
+only removes the data-blocks the job created and restores renamed ones (a data
+snapshot, which does not undo property, visibility, selection or scene
+changes; --reset snapshot is for scripts that make none). Jobs whose script
+needs another .blend than the pool's are refused. Each reply reports queue,
+run and reset times.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import queue
+import runpy
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+import traceback
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BLEND = os.path.join(REPO_ROOT, "public", "models", "Z-Anatomy", "Startup.blend")
+DEFAULT_PORT = 8765
+
+# Job names for the pipeline scripts (anything else is a script path)
+JOBS = {
+    "inspect": "scripts/inspect-blender.py",
+    "ontology": "scripts/extract-z-anatomy-ontology.py",
+    "export": "scripts/export-z-anatomy-main-systems.py",
+    "biomechanics": "scripts/export-z-anatomy-biomechanics.py",
+    "render": "scripts/render-z-anatomy-thumbnails.py",
+    "lite": "scripts/build-z-anatomy-lite.py",
+}
+
+# Read-only jobs, reset with a data snapshot; every other job changes existing
+# data (selection, visibility, render settings, the atlas) and is reverted
+SNAPSHOT_JOBS = {"inspect", "ontology"}
+
+# Scripts that need a specific .blend (basename) rather than the pool's
+SCRIPT_BLENDS = {"build-z-anatomy-lite.py": "Z-Anatomy.blend"}
+
+# Worker lines on stdout carrying events, everything else is Blender output
+MARKER = "@@pool "
+
+# Data-block collections covered by the snapshot
+ID_COLLECTIONS = ("objects", "meshes", "curves", "materials", "collections", "actions", "armatures",
+                  "cameras", "lights", "images", "texts", "node_groups", "fonts", "worlds", "libraries")
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv and "bpy" in sys.modules else sys.argv[1:]
+    script_args = []
+    if "--" in argv:
+        argv, script_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(description="Warm Blender worker pool")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Start the pool")
+    serve.add_argument("--blend", default=DEFAULT_BLEND)
+    serve.add_argument("--workers", type=int, default=2)
+    serve.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                       help="Blender executable (default: $BLENDER or blender)")
+    submit = commands.add_parser("submit", help="Run a job on the pool and print its output")
+    submit.add_argument("job", help=f"Job ({', '.join(JOBS)}) or script path")
+    submit.add_argument("--reset", choices=["snapshot", "revert"], default=None,
+                        help="How the worker is reset after the job (snapshot only for scripts "
+                             "that change no existing data)")
+    commands.add_parser("status", help="Show the workers and their job counts")
+    commands.add_parser("worker", help=argparse.SUPPRESS)  # inside Blender, started by serve
+    args = parser.parse_args(argv)
+    args.script_args = script_args
+    return args
+
+def emit(event, **fields):
+    print(MARKER + json.dumps({"event": event, **fields}), flush=True)
+
+# Worker (inside Blender)
+
+def snapshot():
+    """session_uid -> name of every data-block, per collection"""
+    import bpy
+    return {name: {block.session_uid: block.name for block in getattr(bpy.data, name)} for name in ID_COLLECTIONS}
+
+def restore(state):
+    """Remove data-blocks created since the snapshot and restore renamed ones"""
+    import bpy
+    created = [block for name in ID_COLLECTIONS for block in getattr(bpy.data, name)
+               if block.session_uid not in state[name]]
+    if created:
+        bpy.data.batch_remove(created)
+    for name in ID_COLLECTIONS:
+        for block in getattr(bpy.data, name):
+            original = state[name].get(block.session_uid)
+            if original is not None and block.name != original:
+                block.name = original
+    return len(created)
+
+def run_script(job):
+    """Run a script as __main__ with its options after "--", returns (exit status, output)"""
+    argv, cwd = sys.argv, os.getcwd()
+    output = io.StringIO()
+    status = 0
+    try:
+        os.chdir(job["cwd"])
+        sys.argv = [job["script"], "--", *job["args"]]
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            runpy.run_path(job["script"], run_name="__main__")
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        status = 1
+        output.write(traceback.format_exc())
+    finally:
+        sys.argv = argv
+        os.chdir(cwd)
+    return status, output.getvalue()
+
+def run_worker():
+    import bpy
+    state = snapshot()
+    scene_frame = bpy.context.scene.frame_current
+    emit("ready", pid=os.getpid())
+    for line in sys.stdin:
+        job = json.loads(line)
+        start = time.perf_counter()
+        status, output = run_script(job)
+        run_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        removed = 0
+        if job["reset"] == "revert":
+            bpy.ops.wm.revert_mainfile()
+            state = snapshot()
+        else:
+            removed = restore(state)
+            bpy.context.scene.frame_set(scene_frame)
+        emit("result", status=status, output=output, removed=removed,
+             runSeconds=round(run_seconds, 3), resetSeconds=round(time.perf_counter() - start, 3))
+
+# Pool (plain Python)
+
+class Worker:
+    """A headless Blender process running jobs sent on its stdin"""
+
+    def __init__(self, index, args):
+        self.index = index
+        self.jobs = 0
+        self.started = time.perf_counter()
+        self.process = subprocess.Popen(
+            [args.blender, "--background", os.path.abspath(args.blend),
+             "--python", os.path.abspath(__file__), "--", "worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def read(self, event):
+        for line in self.process.stdout:
+            if line.startswith(MARKER):
+                message = json.loads(line[len(MARKER):])
+                if message["event"] == event:
+                    return message
+        raise RuntimeError(f"worker {self.index} exited with code {self.process.wait()}")
+
+    def wait_ready(self):
+        self.read("ready")
+        self.load_seconds = time.perf_counter() - self.started
+        print(f"  🟢 Worker {self.index} ready in {self.load_seconds:.1f} s")
+
+    def run(self, job):
+        self.process.stdin.write(json.dumps(job) + "\n")
+        self.process.stdin.flush()
+        result = self.read("result")
+        self.jobs += 1
+        return result
+
+class Pool:
+    def __init__(self, args):
+        self.args = args
+        self.workers = [Worker(index, args) for index in range(args.workers)]
+        self.idle = queue.Queue()
+        for worker in self.workers:
+            worker.wait_ready()
+            self.idle.put(worker)
+
+    def submit(self, job):
+        blend = SCRIPT_BLENDS.get(os.path.basename(job["script"]))
+        if blend and blend != os.path.basename(self.args.blend):
+            return {"error": f"{job['name']} needs {blend}, the pool has {os.path.basename(self.args.blend)} loaded"}
+        queued = time.perf_counter()
+        while True:
+            try:
+                worker = self.idle.get(timeout=1)
+                break
+            except queue.Empty:
+                if not any(self.workers):
+                    return {"error": "no workers left, restart the pool"}
+        queue_seconds = time.perf_counter() - queued
+        try:
+            result = worker.run(job)
+        except (RuntimeError, OSError) as e:
+            result = {"status": 1, "output": str(e), "runSeconds": 0, "resetSeconds": 0}
+            index = worker.index
+            try:
+                worker = self.replace(worker)
+            except (RuntimeError, OSError) as restart_error:
+                # not queued again, the pool carries on with fewer workers
+                self.workers[index] = None
+                print(f"❌ Worker {index} could not be restarted: {restart_error}")
+                result.update(worker=index, queueSeconds=round(queue_seconds, 3))
+                return result
+        self.idle.put(worker)
+        result.update(worker=worker.index, queueSeconds=round(queue_seconds, 3))
+        print(f"⏱️  {job['name']} on worker {worker.index}: queue {queue_seconds:.2f} s, "
+              f"run {result['runSeconds']:.2f} s, reset {result['resetSeconds']:.2f} s → exit {result['status']}")
+        return result
+
+    def replace(self, worker):
+        """Start a new process in place of a crashed worker"""
+        print(f"⚠️  Restarting worker {worker.index}")
+        fresh = Worker(worker.index, self.args)
+        fresh.wait_ready()
+        self.workers[worker.index] = fresh
+        return fresh
+
+    def status(self):
+        return {"blend": os.path.abspath(self.args.blend), "idle": self.idle.qsize(),
+                "workers": [{"index": w.index, "pid": w.process.pid, "jobs": w.jobs,
+                             "loadSeconds": round(w.load_seconds, 1)} for w in self.workers if w]}
+
+class PoolHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            request = json.loads(line)
+            try:
+                if request.get("command") == "status":
+                    reply = self.server.pool.status()
+                else:
+                    reply = self.server.pool.submit(request)
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write((json.dumps(reply) + "\n").encode())
+
+class PoolServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+def serve(args):
+    print(f"\n🏊 Starting {args.workers} Blender workers on {args.blend}")
+    print("=" * 70)
+    pool = Pool(args)
+    with PoolServer(("127.0.0.1", args.port), PoolHandler) as server:
+        server.pool = pool
+        print(f"\n✅ Listening on 127.0.0.1:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    for worker in filter(None, pool.workers):
+        worker.process.terminate()
+
+def request(port, message):
+    with socket.create_connection(("127.0.0.1", port)) as connection:
+        connection.sendall((json.dumps(message) + "\n").encode())
+        with connection.makefile() as reply:
+            return json.loads(reply.readline())
+
+def submit(args):
+    script = os.path.join(REPO_ROOT, JOBS[args.job]) if args.job in JOBS else os.path.abspath(args.job)
+    reset = args.reset or ("snapshot" if args.job in SNAPSHOT_JOBS else "revert")
+    result = request(args.port, {"name": args.job, "script": script, "args": args.script_args,
+                                 "cwd": os.getcwd(), "reset": reset})
+    if "error" in result:
+        print(f"❌ {result['error']}")
+        sys.exit(1)
+    sys.stdout.write(result["output"])
+    print(f"\n⏱️  Worker {result['worker']}: queue {result['queueSeconds']:.2f} s, "
+          f"run {result['runSeconds']:.2f} s, reset {result['resetSeconds']:.2f} s")
+    sys.exit(result["status"])
+
+def main():
+    args = parse_args()
+    if args.command == "worker":
+        run_worker()
+    elif args.command == "serve":
+        serve(args)
+    elif args.command == "submit":
+        submit(args)
+    else:
+        print(json.dumps(request(args.port, {"command": "status"}), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Build Z-Anatomy-lite.blend from Z-Anatomy.blend
+Usage: blender --background public/models/Z-Anatomy/Z-Anatomy.blend --python scripts/build-z-anatomy-lite.py -- [options]
+
+The lite file keeps the scene, workspaces and the --keep-layer layers (decimated
+to proxies). Every other layer is removed and listed in the scene so that
+the add-on can append it from Z-Anatomy.blend on demand (LAYERS_OT_add_layer).
+Descriptions are removed as well, the add-on links them lazily.
+"""
+
+import bpy
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Texts that stay in the lite file (the add-on links the rest on demand)
+KEEP_TEXTS = {"z-anatomy.py"}
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Build Z-Anatomy-lite.blend")
+    parser.add_argument("--output", default=None,
+                        help="Output path (default: Z-Anatomy-lite.blend next to the source)")
+    parser.add_argument("--keep-layer", action="append", default=[],
+                        help="Layer kept in the lite file as decimated proxies (repeatable)")
+    parser.add_argument("--proxy-ratio", type=float, default=0.1,
+                        help="Decimate ratio for kept layer meshes")
+    parser.add_argument("--max-size-mb", type=float, default=150.0,
+                        help="Fail if the lite file is larger than this")
+    parser.add_argument("--max-load-seconds", type=float, default=20.0,
+                        help="Fail if opening the lite file headless takes longer than this")
+    return parser.parse_args(argv)
+
+def build_layer_index(scene):
+    """Layer list and the per-layer data LAYERS_OT_add_layer needs, read from the data"""
+    layers = []
+    index = {}
+    for collection in scene.collection.children:
+        meshes = [ob for ob in collection.all_objects if ob.type == 'MESH']
+        layers.append(collection.name)
+        index[collection.name] = {
+            "objects": len(collection.all_objects),
+            "active": meshes[0].name if meshes else (collection.objects[0].name if collection.objects else ""),
+        }
+    return layers, index
+
+def remove_layer(collection, kept):
+    """Remove a layer collection, its nested collections and all their objects
+
+    Collections and objects also linked into a kept collection stay in the file.
+    """
+    for obj in collection.all_objects[:]:
+        if not kept.intersection(obj.users_collection):
+            bpy.data.objects.remove(obj, do_unlink=True)
+    for child in collection.children_recursive[:]:
+        if child not in kept:
+            bpy.data.collections.remove(child)
+    bpy.data.collections.remove(collection)
+
+def make_proxies(collection, ratio):
+    """Replace the meshes of a kept layer with decimated copies"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    triangles_before = triangles_after = 0
+    for obj in collection.all_objects:
+        if obj.type != 'MESH' or obj.data.users > 1:
+            continue
+        triangles_before += sum(len(p.vertices) - 2 for p in obj.data.polygons)
+        mod = obj.modifiers.new(name='Proxy', type='DECIMATE')
+        mod.ratio = ratio
+        depsgraph.update()
+        proxy = bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph))
+        obj.modifiers.remove(mod)
+        old_mesh = obj.data
+        name = old_mesh.name
+        obj.data = proxy
+        bpy.data.meshes.remove(old_mesh)
+        proxy.name = name  # keep the English data name (translations, descriptions)
+        obj['lite_proxy'] = True
+        triangles_after += sum(len(p.vertices) - 2 for p in proxy.polygons)
+    return triangles_before, triangles_after
+
+def measure_load_time(path):
+    """Open the file in a fresh headless Blender and time it
+
+    Without --factory-startup: the user preferences enable the add-on, whose
+    load handlers are part of opening the file.
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [bpy.app.binary_path, "--background", path, "--python-expr", "import bpy"],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def build_lite():
+    args = parse_args()
+    source = bpy.data.filepath
+    output = args.output or os.path.join(os.path.dirname(source), "Z-Anatomy-lite.blend")
+    scene = bpy.context.scene
+
+    print("\n🪶 Building Z-Anatomy-lite.blend")
+    print("=" * 70)
+    print(f"  Source: {source}")
+
+    layers, index = build_layer_index(scene)
+    missing = [name for name in args.keep_layer if name not in layers]
+    if missing:
+        print(f"❌ Unknown layers: {', '.join(missing)}")
+        sys.exit(1)
+
+    print(f"\n📦 {len(layers)} layers:")
+    for name in layers:
+        kept = name in args.keep_layer
+        print(f"  {'🟢' if kept else '⚪'} {name} ({index[name]['objects']} objects)")
+
+    kept = set()
+    for collection in scene.collection.children:
+        if collection.name in args.keep_layer:
+            kept |= {collection, *collection.children_recursive}
+
+    for collection in scene.collection.children[:]:
+        if collection.name in args.keep_layer:
+            before, after = make_proxies(collection, args.proxy_ratio)
+            print(f"  🔻 {collection.name}: {before:,} → {after:,} triangles")
+        else:
+            remove_layer(collection, kept)
+
+    for text in [t for t in bpy.data.texts if t.name not in KEEP_TEXTS]:
+        bpy.data.texts.remove(text)
+
+    # the add-on reads these instead of a hardcoded layer list
+    scene['zanatomy_layers'] = layers
+    scene['zanatomy_layer_index'] = json.dumps(index)
+    scene['zanatomy_lite_source'] = os.path.basename(source)
+
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+    bpy.ops.wm.save_as_mainfile(filepath=output, compress=True, copy=True)
+
+    size_mb = os.path.getsize(output) / (1024 * 1024)
+    load_seconds = measure_load_time(output)
+    print(f"\n💾 Saved: {output}")
+    print(f"  Size: {size_mb:.1f} MB (budget {args.max_size_mb:.1f} MB)")
+    print(f"  Load: {load_seconds:.2f} s (budget {args.max_load_seconds:.2f} s)")
+
+    failed = []
+    if size_mb > args.max_size_mb:
+        failed.append("size")
+    if load_seconds > args.max_load_seconds:
+        failed.append("load time")
+    if failed:
+        print(f"\n❌ Over budget: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ Lite file within budget")
+
+if __name__ == "__main__":
+    build_lite()
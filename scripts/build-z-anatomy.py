@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Build the Z-Anatomy web assets from the .blend in one incremental command
+Usage: python3 scripts/build-z-anatomy.py [--blend <file>] [--jobs N] [--only <stage>] [--force] [--dry-run] [--pool] [-- export options]
+
+The pipeline is a graph of stages with declared inputs and outputs. A stage
+depends on the stages producing its inputs:
+
+  inspect   .blend -> structure report and data-block fingerprint
+  ontology  names, collections, translations, mesh content -> ontology, search index, partId registry
+  export    geometry, partIds -> full-detail GLBs, labels, picking proxies, visibility
+  lod       geometry, partIds -> -med and -low GLBs
+  manifest  exported files -> public/models/z-anatomy-assets.json (path -> bytes, content hash)
+
+A stage is rebuilt when the hash of its inputs differs from its last successful
+build, or when one of its outputs is missing or was changed since. Inputs are
+files plus, for the .blend, only the data-block types the stage reads (from the
+fingerprint), so editing translations does not re-export geometry and re-saving
+an unchanged .blend rebuilds nothing past inspect. Stages whose dependencies are
+done run concurrently (--jobs). Options after "--" go to the export script for
+export and lod, e.g. -- --dual-codec --cleanup.
+
+State and per-stage logs live in .build/.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_DIR = os.path.join(REPO_ROOT, ".build")
+STATE_PATH = os.path.join(BUILD_DIR, "state.json")
+
+DEFAULT_BLEND = "public/models/Z-Anatomy/Startup.blend"
+FINGERPRINT = ".build/z-anatomy-fingerprint.json"
+EXPORT_SCRIPT = "scripts/export-z-anatomy-main-systems.py"
+ASSET_MANIFEST = "public/models/z-anatomy-assets.json"
+
+def parse_args():
+    argv = sys.argv[1:]
+    export_args = []
+    if "--" in argv:
+        argv, export_args = argv[:argv.index("--")], argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(description="Incremental Z-Anatomy asset build")
+    parser.add_argument("--blend", default=DEFAULT_BLEND)
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--jobs", type=int, default=2,
+                        help="Stages run at the same time (each loads the .blend)")
+    parser.add_argument("--only", action="append", default=None,
+                        help="Build this stage and what it depends on (repeatable)")
+    parser.add_argument("--force", action="store_true",
+                        help="Rebuild every selected stage")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Show which stages are stale without building")
+    parser.add_argument("--pool", action="store_true",
+                        help="Run Blender stages on a running worker pool (scripts/blender-worker-pool.py), "
+                             "which must have the current .blend loaded")
+    args = parser.parse_args(argv)
+    args.export_args = export_args
+    return args
+
+class Stage:
+    """A build node: a Blender script (or run function) with declared inputs and outputs
+
+    Paths are relative to the repository and may be glob patterns. outputs must
+    exist after a build, optional outputs are recorded when present. blocks are the
+    fingerprint sections (data-block types) a stage reads from the .blend. after
+    names stages that must finish first although no declared file links them.
+    """
+
+    def __init__(self, name, inputs, outputs, optional=(), script=None, args=(), blocks=None, run=None, after=()):
+        self.name = name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.optional = list(optional)
+        self.script = script
+        self.args = list(args)
+        self.blocks = blocks
+        self.run = run
+        self.after = set(after)
+        self.deps = set()
+
+def define_stages(args):
+    blend = os.path.relpath(os.path.abspath(args.blend), REPO_ROOT)
+    geometry = ("meshes", "curves", "objects", "collections", "materials")
+    # the Draco settings are also updated by --search-quantization runs of these stages,
+    # so lod runs after export instead of next to it
+    export_inputs = [FINGERPRINT, EXPORT_SCRIPT, "scripts/measure-glb-decode.js",
+                     "data/z-anatomy-part-ids.json", "data/z-anatomy-draco-settings.json"]
+    export = Stage(
+        "export", export_inputs,
+        outputs=["public/models/*/*-full.glb", "public/models/*/*-full.labels.json",
+                 "public/models/*/*-full-pick.glb", "public/models/*/*-full.visibility.json"],
+        optional=["public/models/respiratory/lung-*.glb", "public/models/*/*-full.q.glb",
+                  "public/models/*/*-full.manifest.json", "public/models/regions/**/*.*",
+                  "public/models/sections/**/*.*"],
+        script=EXPORT_SCRIPT, args=["--lod", "high", *args.export_args], blocks=geometry)
+    lod = Stage(
+        "lod", export_inputs,
+        outputs=["public/models/*/*-full-med.glb", "public/models/*/*-full-low.glb"],
+        optional=["public/models/*/*-full-med.q.glb", "public/models/*/*-full-low.q.glb",
+                  "public/models/*/*-full-med.manifest.json", "public/models/*/*-full-low.manifest.json"],
+        script=EXPORT_SCRIPT, args=["--lod", "medium", "--lod", "low", *args.export_args], blocks=geometry,
+        after=["export"])
+    return [
+        Stage("inspect", [blend, "scripts/inspect-blender.py"],
+              outputs=["public/models/z-anatomy-structure.json", FINGERPRINT],
+              script="scripts/inspect-blender.py", args=["--fingerprint", os.path.join(REPO_ROOT, FINGERPRINT)]),
+        Stage("ontology", [FINGERPRINT, "scripts/extract-z-anatomy-ontology.py"],
+              outputs=["data/z-anatomy-ontology.json", "data/z-anatomy-ontology.ts",
+                       "data/z-anatomy-search-index.json", "data/z-anatomy-part-ids.json", "data/bulk/*.csv"],
+              script="scripts/extract-z-anatomy-ontology.py", blocks=("meshes", "objects", "collections", "texts")),
+        export,
+        lod,
+        Stage("manifest", [*export.outputs, *export.optional, *lod.outputs, *lod.optional],
+              outputs=[ASSET_MANIFEST], run=write_asset_manifest),
+    ]
+
+def link_stages(stages):
+    """Set each stage's dependencies (the stages producing its inputs), in dependency order"""
+    producers = {pattern: stage.name for stage in stages for pattern in stage.outputs + stage.optional}
+    for stage in stages:
+        stage.deps = {producers[pattern] for pattern in stage.inputs
+                      if pattern in producers and producers[pattern] != stage.name} | stage.after
+    ordered, seen = [], set()
+    while len(ordered) < len(stages):
+        ready = [stage for stage in stages if stage.name not in seen and stage.deps <= seen]
+        if not ready:
+            raise SystemExit(f"❌ Dependency cycle between {sorted(s.name for s in stages if s.name not in seen)}")
+        ordered += ready
+        seen |= {stage.name for stage in ready}
+    return ordered
+
+def select(stages, names):
+    """The named stages and everything they depend on"""
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(names) - set(by_name)
+    if unknown:
+        raise SystemExit(f"❌ Unknown stage(s): {', '.join(sorted(unknown))} (stages: {', '.join(by_name)})")
+    wanted, todo = set(), list(names)
+    while todo:
+        name = todo.pop()
+        if name not in wanted:
+            wanted.add(name)
+            todo += by_name[name].deps
+    return [stage for stage in stages if stage.name in wanted]
+
+# Content hashes
+
+class State:
+    """Last successful build of each stage, plus file hashes cached by size and mtime"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {"files": {}, "stages": {}}
+        if os.path.exists(STATE_PATH):
+            with open(STATE_PATH) as f:
+                self.data = json.load(f)
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        rel = os.path.relpath(path, REPO_ROOT)
+        with self.lock:
+            cached = self.data["files"].get(rel)
+        if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        with self.lock:
+            self.data["files"][rel] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def pattern_hash(self, pattern, blocks=None):
+        """Hash of the files matching pattern, None if there are none. With blocks,
+        the pattern is the fingerprint and only those data-block types count"""
+        paths = expand(pattern)
+        if not paths:
+            return None
+        if blocks is not None:
+            with open(paths[0]) as f:
+                fingerprint = json.load(f)
+            return hash_json({name: fingerprint.get(name) for name in blocks})
+        return hash_json([[os.path.relpath(path, REPO_ROOT), self.file_hash(path)] for path in paths])
+
+    def record(self, name, entry):
+        with self.lock:
+            self.data["stages"][name] = entry
+            self.save()
+
+    def save(self):
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        with open(STATE_PATH + ".tmp", 'w') as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        os.replace(STATE_PATH + ".tmp", STATE_PATH)
+
+def expand(pattern):
+    return sorted(path for path in glob.glob(os.path.join(REPO_ROOT, pattern), recursive=True)
+                  if os.path.isfile(path))
+
+def hash_json(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+def stage_key(stage, state):
+    """Hash of everything a stage's outputs depend on"""
+    inputs = {pattern: state.pattern_hash(pattern, stage.blocks if pattern == FINGERPRINT else None)
+              for pattern in stage.inputs}
+    return hash_json({"script": stage.script, "args": stage.args, "inputs": inputs})
+
+def output_hashes(stage, state):
+    return {pattern: state.pattern_hash(pattern) for pattern in stage.outputs + stage.optional}
+
+def stale_reason(stage, key, state):
+    record = state.data["stages"].get(stage.name)
+    if record is None:
+        return "never built"
+    if record["key"] != key:
+        changed = [pattern for pattern, value in record.get("inputs", {}).items()
+                   if value != state.pattern_hash(pattern, stage.blocks if pattern == FINGERPRINT else None)]
+        return f"changed: {', '.join(changed)}" if changed else "command changed"
+    for pattern, value in output_hashes(stage, state).items():
+        if pattern in stage.outputs and value is None:
+            return f"missing: {pattern}"
+        if value != record["outputs"].get(pattern):
+            return f"modified: {pattern}"
+    return None
+
+# Stages
+
+def write_asset_manifest(stage, state):
+    """Deployable files under public/ -> size and content hash (for cache busting)"""
+    public = os.path.join(REPO_ROOT, "public")
+    assets = {}
+    for pattern in stage.inputs:
+        for path in expand(pattern):
+            url = "/" + os.path.relpath(path, public).replace(os.sep, "/")
+            assets[url] = {"bytes": os.path.getsize(path), "hash": state.file_hash(path)[:16]}
+    with open(os.path.join(REPO_ROOT, ASSET_MANIFEST), 'w') as f:
+        json.dump({"assets": dict(sorted(assets.items()))}, f, indent=2)
+
+def blender_command(stage, args):
+    script = os.path.join(REPO_ROOT, stage.script)
+    if args.pool:
+        return [sys.executable, os.path.join(REPO_ROOT, "scripts", "blender-worker-pool.py"),
+                "submit", script, "--", *stage.args]
+    # without --python-exit-code Blender exits 0 when the script raises
+    return [args.blender, "--background", os.path.abspath(args.blend), "--python-exit-code", "1",
+            "--python", script, "--", *stage.args]
+
+def build_stage(stage, args, state, upstream):
+    """Rebuild a stage if it is stale, returns its result for the summary"""
+    if args.dry_run and upstream:
+        return {"status": "stale", "seconds": 0.0, "reason": f"after {', '.join(sorted(upstream))}"}
+    key = stage_key(stage, state)
+    reason = "forced" if args.force else stale_reason(stage, key, state)
+    if reason is None:
+        return {"status": "fresh", "seconds": 0.0, "reason": ""}
+    if args.dry_run:
+        return {"status": "stale", "seconds": 0.0, "reason": reason}
+
+    print(f"▶️  {stage.name}: {reason}", flush=True)
+    log_path = os.path.join(BUILD_DIR, "logs", f"{stage.name}.log")
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    start = time.perf_counter()
+    with open(log_path, 'w') as log:
+        try:
+            if stage.run:
+                stage.run(stage, state)
+                status = 0
+            else:
+                status = subprocess.run(blender_command(stage, args), cwd=REPO_ROOT,
+                                        stdout=log, stderr=subprocess.STDOUT).returncode
+        except Exception:
+            log.write(traceback.format_exc())
+            status = 1
+    seconds = time.perf_counter() - start
+
+    outputs = output_hashes(stage, state)
+    missing = [pattern for pattern in stage.outputs if outputs[pattern] is None]
+    if status != 0 or missing:
+        why = f"exit code {status}" if status != 0 else f"no {', '.join(missing)}"
+        print(f"❌ {stage.name} failed ({why}), see {os.path.relpath(log_path, REPO_ROOT)}", flush=True)
+        return {"status": "failed", "seconds": seconds, "reason": why}
+    # hashed after the run, so inputs a stage updates itself don't make it stale again
+    state.record(stage.name, {
+        "key": stage_key(stage, state),
+        "inputs": {pattern: state.pattern_hash(pattern, stage.blocks if pattern == FINGERPRINT else None)
+                   for pattern in stage.inputs},
+        "outputs": outputs,
+        "seconds": round(seconds, 2),
+    })
+    print(f"✅ {stage.name} built in {seconds:.1f} s", flush=True)
+    return {"status": "built", "seconds": seconds, "reason": reason}
+
+def build(stages, args, state):
+    """Run stages as their dependencies finish, up to --jobs at a time"""
+    results = {}
+    pending = list(stages)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        while pending or running:
+            for stage in list(pending):
+                if not stage.deps <= set(results):
+                    continue
+                pending.remove(stage)
+                blocked = [dep for dep in stage.deps if results[dep]["status"] in ("failed", "skipped")]
+                if blocked:
+                    results[stage.name] = {"status": "skipped", "seconds": 0.0, "reason": f"{', '.join(blocked)} failed"}
+                    continue
+                upstream = {dep for dep in stage.deps if results[dep]["status"] == "stale"}
+                running[executor.submit(build_stage, stage, args, state, upstream)] = stage.name
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+    return results
+
+def print_summary(stages, results, elapsed):
+    print("\n⏱️  Stage timings")
+    print("-" * 70)
+    for stage in stages:
+        result = results[stage.name]
+        print(f"  {stage.name:<10} {result['status']:<8} {result['seconds']:>8.1f} s  {result['reason']}")
+    print("-" * 70)
+    print(f"  {'total':<10} {'':<8} {elapsed:>8.1f} s  "
+          f"({sum(result['seconds'] for result in results.values()):.1f} s of stage time)")
+
+def main():
+    args = parse_args()
+    stages = link_stages(define_stages(args))
+    if args.only:
+        stages = select(stages, args.only)
+
+    print(f"\n🏗️  Building Z-Anatomy assets from {args.blend}")
+    print("=" * 70)
+    state = State()
+    start = time.perf_counter()
+    results = build(stages, args, state)
+    state.save()
+    print_summary(stages, results, time.perf_counter() - start)
+
+    if any(result["status"] in ("failed", "skipped") for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,9 @@ import bpy
 import os
 import sys
 
-# Output directory
-OUTPUT_DIR = "../public/models"
+# Output directory (relative to the repository, whatever the working directory)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(REPO_ROOT, "public", "models")
 
 def export_collection_to_glb(collection_name, output_path):
     """Export a specific collection to GLB"""
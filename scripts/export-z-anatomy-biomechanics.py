@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Export the Biomechanics rig with its motions to GLB
+Usage: blender --background public/models/Z-Anatomy/Startup.blend --python scripts/export-z-anatomy-biomechanics.py -- [options]
+
+Writes the armature, the meshes it deforms and every action posing its bones.
+Each action is sampled per frame and reduced to the fewest linear keys within
+--tolerance (quaternion components, metres and scale factors alike), then the
+GLB's animation channels are quantized with gltfpack. A size/error report for
+each --sweep tolerance goes to <file>.report.json.
+"""
+
+import bpy
+import argparse
+import json
+import numpy as np
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_PATH = os.path.join(REPO_ROOT, "public", "models", "biomechanics", "biomechanics.glb")
+
+# gltfpack animation quantization (bits per component)
+ROTATION_BITS = 12
+TRANSLATION_BITS = 16
+SCALE_BITS = 16
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Export the Biomechanics rig with its motions to GLB")
+    parser.add_argument("--armature", default="Armature",
+                        help="Armature object to export")
+    parser.add_argument("--view-layer", default="Biomechanics",
+                        help="View layer the rig lives in")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.002,
+                        help="Max deviation of the reduced channels from the sampled motion")
+    parser.add_argument("--sweep", type=float, action="append", default=None,
+                        help="Tolerances to report size against error for (repeatable)")
+    return parser.parse_args(argv)
+
+def bone_actions(armature):
+    """Actions animating bones of the armature"""
+    bones = set(armature.data.bones.keys())
+    actions = []
+    for action in bpy.data.actions:
+        paths = [fc.data_path for fc in action.fcurves if fc.data_path.startswith('pose.bones["')]
+        if any(path.split('"')[1] in bones for path in paths):
+            actions.append(action)
+    return actions
+
+def sample_action(rig, action):
+    """{bone: (frames, 10) array of location, rotation quaternion, scale} for every frame"""
+    scene = bpy.context.scene
+    rig.animation_data.action = action
+    start, end = (int(round(frame)) for frame in action.frame_range)
+    channels = {bone.name: [] for bone in rig.pose.bones}
+    for frame in range(start, end + 1):
+        scene.frame_set(frame)
+        for bone in rig.pose.bones:
+            location, rotation, scale = bone.matrix_basis.decompose()
+            channels[bone.name].append([*location, *rotation, *scale])
+    rig.animation_data.action = None
+
+    samples = {}
+    for name, values in channels.items():
+        values = np.array(values)
+        # q and -q are the same rotation, keep neighbours in the same hemisphere
+        rotation = values[:, 3:7]
+        flips = np.cumsum(np.sum(rotation[1:] * rotation[:-1], axis=1) < 0) % 2
+        rotation[1:][flips == 1] *= -1
+        samples[name] = values
+    return start, samples
+
+def reduce_keys(values, tolerance):
+    """Frames to key so linear interpolation stays within tolerance (Ramer-Douglas-Peucker)"""
+    keep = np.zeros(len(values), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(values) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        t = (np.arange(a + 1, b) - a) / (b - a)
+        line = values[a] + t[:, None] * (values[b] - values[a])
+        error = np.abs(values[a + 1:b] - line).max(axis=1)
+        i = int(error.argmax())
+        if error[i] > tolerance:
+            keep[a + 1 + i] = True
+            stack += [(a, a + 1 + i), (a + 1 + i, b)]
+    return np.flatnonzero(keep)
+
+def reconstruction_error(values, keys):
+    """Max deviation of linear interpolation through keys from all samples"""
+    frames = np.arange(len(values))
+    return max(float(np.abs(np.interp(frames, keys, values[keys, i]) - values[:, i]).max())
+               for i in range(values.shape[1]))
+
+# Channels equal to these throughout need no curves
+REST_POSE = {"location": (0, 0, 0), "rotation_quaternion": (1, 0, 0, 0), "scale": (1, 1, 1)}
+
+def reduced_action(name, start, samples, tolerance):
+    """New action with linear keys per bone channel, plus its key count and max error"""
+    action = bpy.data.actions.new(name)
+    groups = (("location", 0, 3), ("rotation_quaternion", 3, 7), ("scale", 7, 10))
+    keys_total = 0
+    worst = 0.0
+    for bone, values in samples.items():
+        for path, first, last in groups:
+            channel = values[:, first:last]
+            if np.allclose(channel, REST_POSE[path]):
+                continue
+            keys = reduce_keys(channel, tolerance)
+            worst = max(worst, reconstruction_error(channel, keys))
+            keys_total += len(keys)
+            for index in range(last - first):
+                fcurve = action.fcurves.new(f'pose.bones["{bone}"].{path}', index=index, action_group=bone)
+                fcurve.keyframe_points.add(len(keys))
+                co = np.column_stack((keys + start, channel[keys, index])).astype(np.float32)
+                fcurve.keyframe_points.foreach_set('co', co.ravel())
+                for point in fcurve.keyframe_points:
+                    point.interpolation = 'LINEAR'
+                fcurve.update()
+    return action, keys_total, worst
+
+@contextmanager
+def rig_copies(armature, meshes):
+    """Copies of the armature (without animation) and its meshes, taking over their names
+
+    The copies live in a temporary collection, the sources are renamed back
+    afterwards and their animation is never touched.
+    """
+    temp = bpy.data.collections.new("_export")
+    bpy.context.scene.collection.children.link(temp)
+    renamed = []
+    try:
+        rig = armature.copy()
+        rig.animation_data_clear()
+        rig.animation_data_create()
+        temp.objects.link(rig)
+        copies = []
+        for obj in meshes:
+            copy = obj.copy()
+            for mod in copy.modifiers:
+                if mod.type == 'ARMATURE' and mod.object == armature:
+                    mod.object = rig
+            if copy.parent == armature:
+                copy.parent = rig
+            temp.objects.link(copy)
+            copies.append(copy)
+
+        for source, copy in [(armature, rig), *zip(meshes, copies)]:
+            # a short placeholder, name + suffix could be cut at the 63-byte name limit
+            name = source.name
+            source.name = f"~{len(renamed)}"
+            renamed.append((source, name))
+            copy.name = name
+            assert copy.name == name, f"{name!r} is still taken, the copy became {copy.name!r}"
+        yield rig, copies
+    finally:
+        for obj in temp.all_objects[:]:
+            bpy.data.objects.remove(obj, do_unlink=True)
+        bpy.data.collections.remove(temp)
+        for source, name in renamed:
+            source.name = name
+
+def export_rig(rig, copies, actions, output_path):
+    """Export the rig copies with one glTF animation per action (as NLA tracks)"""
+    for name, action in actions.items():
+        track = rig.animation_data.nla_tracks.new()
+        track.name = name
+        track.strips.new(name, int(action.frame_range[0]), action)
+
+    bpy.ops.object.select_all(action='DESELECT')
+    for obj in [rig, *copies]:
+        obj.select_set(True)
+    bpy.ops.export_scene.gltf(
+        filepath=output_path,
+        use_selection=True,
+        export_format='GLB',
+        # gltfpack reads no Draco, the meshes are quantized with the animation
+        export_draco_mesh_compression_enable=False,
+        export_skins=True,
+        export_animations=True,
+        export_animation_mode='NLA_TRACKS',
+        export_force_sampling=False,
+        export_yup=True
+    )
+    bpy.ops.object.select_all(action='DESELECT')
+    for track in rig.animation_data.nla_tracks[:]:
+        rig.animation_data.nla_tracks.remove(track)
+
+def quantize_animation(source_path, output_path):
+    """Quantize animation channels (and vertex attributes) with gltfpack"""
+    gltfpack = shutil.which("gltfpack")
+    if not gltfpack:
+        print("⚠️  gltfpack not found on PATH, animation channels stay float")
+        shutil.copyfile(source_path, output_path)
+        return False
+    # -af 0: keep the reduced keys rather than resampling at 30 Hz
+    subprocess.run([gltfpack, "-i", source_path, "-o", output_path, "-kn", "-km", "-ke", "-af", "0",
+                    "-ar", str(ROTATION_BITS), "-at", str(TRANSLATION_BITS), "-as", str(SCALE_BITS)],
+                   check=True, stdout=subprocess.DEVNULL)
+    return True
+
+def export_biomechanics():
+    args = parse_args()
+    tolerances = sorted(set(args.sweep or [0.0005, 0.002, 0.01]) | {args.tolerance})
+
+    print("\n🦴 Exporting Z-Anatomy Biomechanics rig")
+    print("=" * 70)
+
+    armature = bpy.data.objects.get(args.armature)
+    if armature is None or armature.type != 'ARMATURE':
+        print(f"❌ Armature not found: {args.armature}")
+        sys.exit(1)
+    meshes = [obj for obj in bpy.data.objects if obj.type == 'MESH' and
+              any(mod.type == 'ARMATURE' and mod.object == armature for mod in obj.modifiers)]
+    actions = bone_actions(armature)
+    print(f"  {len(meshes)} skinned meshes, {len(actions)} motions")
+    if not actions:
+        print("❌ No motions found")
+        sys.exit(1)
+
+    layer = bpy.context.scene.view_layers.get(args.view_layer)
+    override = {"view_layer": layer} if layer else {}
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    report = []
+    with bpy.context.temp_override(**override), rig_copies(armature, meshes) as (rig, copies), \
+            tempfile.TemporaryDirectory() as tmp:
+        samples = {action.name: sample_action(rig, action) for action in actions}
+        frames = sum(len(next(iter(values.values()))) for _, values in samples.values())
+
+        for tolerance in tolerances:
+            reduced = {}
+            keys = 0
+            error = 0.0
+            for name, (start, values) in samples.items():
+                reduced[name], action_keys, action_error = reduced_action(name + "~reduced", start, values, tolerance)
+                keys += action_keys
+                error = max(error, action_error)
+
+            raw_path = os.path.join(tmp, "raw.glb")
+            export_rig(rig, copies, reduced, raw_path)
+            output_path = args.output if tolerance == args.tolerance else os.path.join(tmp, "sweep.glb")
+            quantize_animation(raw_path, output_path)
+            for action in reduced.values():
+                bpy.data.actions.remove(action)
+
+            report.append({"tolerance": tolerance, "keys": keys, "maxError": error,
+                           "bytes": os.path.getsize(output_path)})
+            marker = "💾" if tolerance == args.tolerance else "  "
+            print(f"{marker} tolerance {tolerance:g}: {keys:,} keys, max error {error:.5f}, "
+                  f"{os.path.getsize(output_path) / (1024 * 1024):.2f} MB")
+
+    report_path = os.path.splitext(args.output)[0] + ".report.json"
+    with open(report_path, 'w') as f:
+        json.dump({
+            "frames": frames,
+            "quantization": {"rotationBits": ROTATION_BITS, "translationBits": TRANSLATION_BITS, "scaleBits": SCALE_BITS},
+            "sweep": report,
+        }, f, indent=2)
+    print(f"\n✅ Exported: {args.output}")
+    print(f"📊 Size/error report: {report_path}")
+
+if __name__ == "__main__":
+    export_biomechanics()
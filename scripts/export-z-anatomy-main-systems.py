@@ -1,17 +1,1085 @@
 #!/usr/bin/env python3
 """
 Export main Z-Anatomy systems to GLB
-Usage: blender --background public/models/Z-Anatomy/Startup.blend --python scripts/export-z-anatomy-main-systems.py
+Usage: blender --background public/models/Z-Anatomy/Startup.blend --python scripts/export-z-anatomy-main-systems.py -- [options]
+
+Each system also gets <file>.labels.json, its .t/.g labels with world anchors for the viewers,
+<file>-pick.glb, one low-poly picking proxy mesh with a per-vertex _PART_ID attribute, and
+<file>.visibility.json, an occlusion rank per part (0 = seen from outside) to order loading.
+
+Options:
+  --merge-by-material   Merge meshes sharing a material into one primitive per material,
+                        with a per-vertex _PART_ID attribute (see <file>.manifest.json)
+  --mirror-instances    Export .l/.r pairs that mirror each other as one mesh used by two
+                        nodes, the .r node with a mirrored transform
+  --dual-codec          Also write a quantized, uncompressed <file>.q.glb (KHR_mesh_quantization,
+                        needs gltfpack on PATH) and record size and decode time of both variants
+                        (decode timed in node with public/draco, see scripts/measure-glb-decode.js)
+  --search-quantization Pick the fewest Draco position bits whose quantization error stays within
+                        --error-budget, per exported file, and record them in
+                        data/z-anatomy-draco-settings.json (reused by later runs)
+  --regions             Also export per-region shards of every system, cut by the region meshes of
+                        "Regions of human body", to regions/<region>/<file>.glb with regions/index.json
+  --sections            Also export every system clipped at standard planes, with cap meshes over the
+                        cuts, to sections/<plane>/<file>.glb with sections/index.json
+                        (--section axis:fraction, repeatable, e.g. transverse:0.75)
+  --cleanup             Weld duplicate vertices, drop degenerate and loose geometry and prune
+                        unused UV/colour layers, vertex groups and material slots on the copies
+  --lod LEVEL           Only export these levels (high, medium, low; repeatable, default all).
+                        Labels, picking proxies, visibility, regions, sections and organs go with high
 """
 
 import bpy
+import bmesh
+import argparse
+import multiprocessing
+import numpy as np
+import json
+import math
 import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from mathutils import Matrix, Vector
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
+
+# Paths are relative to the repository, whatever the working directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Output directory
-OUTPUT_DIR = os.path.abspath("public/models")
+OUTPUT_DIR = os.path.join(REPO_ROOT, "public", "models")
+
+# partId registry written by extract-z-anatomy-ontology.py
+PART_REGISTRY_PATH = os.path.join(REPO_ROOT, "data", "z-anatomy-part-ids.json")
+
+# Draco settings chosen per exported file by --search-quantization
+DRACO_SETTINGS_PATH = os.path.join(REPO_ROOT, "data", "z-anatomy-draco-settings.json")
+DEFAULT_POSITION_BITS = 14  # exporter default
+POSITION_BITS = range(8, 17)
+
+# Export levels (--lod), -full, -med and -low files
+LODS = ("high", "medium", "low")
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Export main Z-Anatomy systems to GLB")
+    parser.add_argument("--merge-by-material", action="store_true",
+                        help="Merge meshes per material with a per-vertex part-ID attribute")
+    parser.add_argument("--mirror-instances", action="store_true",
+                        help="Share one mesh between mirrored .l/.r pairs")
+    parser.add_argument("--mirror-tolerance", type=float, default=1e-4,
+                        help="Max vertex distance (m) for a .l/.r pair to count as mirrored")
+    parser.add_argument("--dual-codec", action="store_true",
+                        help="Also export a quantized (KHR_mesh_quantization) variant without Draco")
+    parser.add_argument("--search-quantization", action="store_true",
+                        help="Search Draco position bits per file against --error-budget")
+    parser.add_argument("--error-budget", type=float, default=1e-4,
+                        help="Max vertex displacement (m) allowed from position quantization")
+    parser.add_argument("--regions", action="store_true",
+                        help="Export per-region, per-system shards and regions/index.json")
+    parser.add_argument("--sections", action="store_true",
+                        help="Export systems clipped at section planes, with caps, and sections/index.json")
+    parser.add_argument("--section", action="append", default=None,
+                        help="Section plane as axis:fraction of the body's extent (sagittal, coronal, transverse)")
+    parser.add_argument("--cleanup", action="store_true",
+                        help="Clean up the copied meshes before export")
+    parser.add_argument("--cleanup-distance", type=float, default=1e-6,
+                        help="Merge distance (m) for duplicate vertices")
+    parser.add_argument("--lod", action="append", choices=LODS, default=None,
+                        help="Levels to export (repeatable, default all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes for the visibility ray casts")
+    return parser.parse_args(argv)
+
+def load_part_ids():
+    """English mesh data-block name -> partId"""
+    if not os.path.exists(PART_REGISTRY_PATH):
+        print(f"⚠️  No partId registry at {PART_REGISTRY_PATH}, using mesh names as part IDs")
+        return {}
+    with open(PART_REGISTRY_PATH) as f:
+        return json.load(f)["ids"]
+
+def load_draco_settings():
+    """Exported file (relative to OUTPUT_DIR) -> recorded Draco settings"""
+    if not os.path.exists(DRACO_SETTINGS_PATH):
+        return {}
+    with open(DRACO_SETTINGS_PATH) as f:
+        return json.load(f)
+
+def save_draco_settings(settings):
+    # keep files recorded by other runs (the build's export and lod stages each record their LODs)
+    settings = {**load_draco_settings(), **settings}
+    with open(DRACO_SETTINGS_PATH, 'w') as f:
+        json.dump(dict(sorted(settings.items())), f, indent=2)
+
+def update_manifest(output_path, **entries):
+    """Merge entries into the <file>.manifest.json next to an exported GLB
+
+    None removes an entry (an option that is off for this export), and the
+    manifest is deleted once it has no entries left.
+    """
+    manifest_path = os.path.splitext(output_path)[0] + ".manifest.json"
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    manifest.update(entries)
+    manifest = {key: value for key, value in manifest.items() if value is not None}
+    if not manifest:
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        return None
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+def export_glb(output_path, draco=True, attributes=False, position_bits=DEFAULT_POSITION_BITS):
+    """Export the selected objects to a GLB"""
+    bpy.ops.export_scene.gltf(
+        filepath=output_path,
+        use_selection=True,
+        export_format='GLB',
+        export_draco_mesh_compression_enable=draco,
+        export_draco_mesh_compression_level=6,
+        export_draco_position_quantization=position_bits,
+        export_apply=True,
+        export_attributes=attributes,
+        export_yup=True
+    )
+
+def quantize_glb(source_path, output_path):
+    """Quantize vertex attributes (KHR_mesh_quantization) with gltfpack, no compression.
+    Blender's exporter cannot write the extension itself."""
+    gltfpack = shutil.which("gltfpack")
+    if not gltfpack:
+        print("⚠️  gltfpack not found on PATH, skipping the quantized variant")
+        return False
+    # keep node names, materials and extras (picking and part IDs rely on them)
+    subprocess.run([gltfpack, "-i", source_path, "-o", output_path, "-kn", "-km", "-ke"],
+                   check=True, stdout=subprocess.DEVNULL)
+    return True
+
+def measure_decode_ms(path):
+    """Geometry decode time of the file with the app's own Draco decoder, in node
+    (scripts/measure-glb-decode.js), or None without node"""
+    node = shutil.which("node")
+    if not node:
+        return None
+    result = subprocess.run([node, os.path.join(REPO_ROOT, "scripts", "measure-glb-decode.js"), path],
+                            check=True, capture_output=True, text=True)
+    return json.loads(result.stdout)["decodeMs"]
+
+def export_variants(output_path, attributes=False, position_bits=DEFAULT_POSITION_BITS):
+    """Draco GLB at output_path plus a quantized <file>.q.glb, described in the manifest"""
+    export_glb(output_path, draco=True, attributes=attributes, position_bits=position_bits)
+    variants = {"draco": {"file": os.path.basename(output_path), "extensions": ["KHR_draco_mesh_compression"]}}
+    
+    quantized_path = os.path.splitext(output_path)[0] + ".q.glb"
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_path = os.path.join(tmp, "raw.glb")
+        export_glb(raw_path, draco=False, attributes=attributes)
+        if quantize_glb(raw_path, quantized_path):
+            variants["quantized"] = {"file": os.path.basename(quantized_path), "extensions": ["KHR_mesh_quantization"]}
+        elif os.path.exists(quantized_path):
+            os.remove(quantized_path)  # from an earlier run, older than the Draco file
+    
+    decode_ms = {key: measure_decode_ms(os.path.join(os.path.dirname(output_path), variant["file"]))
+                 for key, variant in variants.items()}
+    if None in decode_ms.values():
+        print("⚠️  node not found on PATH, the variants are compared by size only")
+    for key, variant in variants.items():
+        variant["bytes"] = os.path.getsize(os.path.join(os.path.dirname(output_path), variant["file"]))
+        if decode_ms[key] is not None:
+            variant["decodeMs"] = decode_ms[key]
+        print(f"  📐 {key}: {variant['bytes'] / (1024 * 1024):.1f} MB"
+              + (f", {decode_ms[key]:.0f} ms decode" if decode_ms[key] is not None else ""))
+    update_manifest(output_path, variants=variants)
+
+def drop_variants(output_path):
+    """Remove the variants of an earlier --dual-codec export, so the loader only sees output_path"""
+    quantized_path = os.path.splitext(output_path)[0] + ".q.glb"
+    if os.path.exists(quantized_path):
+        os.remove(quantized_path)
+    update_manifest(output_path, variants=None)
+
+# Smallest tube feature worth geometry per LOD: one pixel at the distance
+# model-loader.ts switches to the LOD (fov 50°, 1080 px viewport), 0.5 mm at full quality
+def pixel_size(distance, fov=math.radians(50), height=1080):
+    return 2 * distance * math.tan(fov / 2) / height
+
+CURVE_FEATURE_SIZE = {"high": 0.0005, "medium": pixel_size(5), "low": pixel_size(15)}
+
+# Label table columns, coordinates in glTF space (Y up, metres)
+LABEL_COLUMNS = ["text", "partId", "group", "anchor", "offset"]
+
+def gltf_co(co):
+    """Blender Z-up coordinates as exported with export_yup"""
+    return [round(co.x, 4), round(co.z, 4), round(-co.y, 4)]
+
+def export_label_table(collection_name, output_path, part_ids):
+    """Write the collection's .t/.g labels as a compact table
+
+    anchor is where the .j leader line meets the structure, offset goes from
+    there to the label text. partId is the owning part (or the group for .g labels).
+    """
+    collection = bpy.data.collections.get(collection_name)
+    if collection is None:
+        return False
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    rows = []
+    for label in [ob for ob in collection.all_objects if ob.type == 'FONT' and re.search(r"\.[tg]$", ob.name)]:
+        line = next((c for c in label.children if c.name.endswith('.j')), None)
+        hook = next((m for m in line.modifiers if m.type == 'HOOK'), None) if line else None
+        owner = hook.object if hook and hook.object else label.parent
+        group = label.name.endswith('.g')
+        if group:
+            col = label.users_collection[0]
+            key = "collection:" + col.get('English', col.name)
+        elif owner is not None and owner.data is not None:
+            key = owner.data.name
+        else:
+            continue
+        
+        text_co = label.matrix_world.translation
+        anchor = text_co
+        if line and line.type == 'MESH':
+            verts = line.evaluated_get(depsgraph).data.vertices
+            if len(verts) == 2:
+                anchor = line.matrix_world @ verts[1].co
+        rows.append([label.data.body, part_ids.get(key, key), group, gltf_co(anchor), gltf_co(text_co - anchor)])
+    
+    rows.sort(key=lambda row: (row[1], row[0]))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({"columns": LABEL_COLUMNS, "rows": rows}, f, separators=(',', ':'))
+    print(f"🏷️  Labels: {output_path} ({len(rows)} labels)")
+    return True
+
+# Reflection across the body's sagittal plane (world X = 0)
+MIRROR_X = Matrix.Scale(-1, 4, (1, 0, 0))
+
+def world_vertices(obj):
+    """(n, 3) array of world-space vertex positions"""
+    co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+    obj.data.vertices.foreach_get('co', co)
+    co = co.reshape(-1, 3)
+    matrix = np.array(obj.matrix_world)
+    return co @ matrix[:3, :3].T + matrix[:3, 3]
+
+def is_mirrored_pair(left, right, tolerance):
+    """True when right is left reflected across X = 0: every vertex within tolerance
+    of a distinct reflected vertex, and the same faces between them"""
+    if len(left.data.vertices) != len(right.data.vertices) or len(left.data.polygons) != len(right.data.polygons):
+        return False
+    if [slot.material for slot in left.material_slots] != [slot.material for slot in right.material_slots]:
+        return False
+    
+    reflected = world_vertices(left) * (-1.0, 1.0, 1.0)
+    target = world_vertices(right)
+    if np.abs(reflected - target).max() <= tolerance:
+        mapping = list(range(len(target)))
+    else:
+        # same shape, different vertex order: nearest neighbour for every vertex,
+        # one-to-one so that no right vertex is left unmatched
+        kd = KDTree(len(target))
+        for i, co in enumerate(target):
+            kd.insert(co, i)
+        kd.balance()
+        matches = [kd.find(co) for co in reflected]
+        if any(distance > tolerance for _, _, distance in matches):
+            return False
+        mapping = [index for _, index, _ in matches]
+        if len(set(mapping)) != len(mapping):
+            return False
+    
+    def faces(mesh, index):
+        return sorted(tuple(sorted(index[v] for v in polygon.vertices)) for polygon in mesh.polygons)
+    
+    return faces(left.data, mapping) == faces(right.data, range(len(target)))
+
+def instance_mirrored_pairs(copies, tolerance):
+    """Make mirrored .r copies reuse their .l counterpart's mesh with a mirrored transform
+
+    Returns the number of vertices no longer exported.
+    """
+    by_name = {copy.name: copy for copy in copies}
+    saved = 0
+    for name, left in by_name.items():
+        if not name.endswith('.l'):
+            continue
+        right = by_name.get(name[:-2] + '.r')
+        if right is None or not is_mirrored_pair(left, right, tolerance):
+            continue
+        saved += len(right.data.vertices)
+        old_mesh = right.data
+        right.data = left.data
+        right.matrix_world = MIRROR_X @ left.matrix_world
+        bpy.data.meshes.remove(old_mesh)
+    return saved
+
+def quantization_error(objects, bits):
+    """Max world-space vertex displacement caused by Draco position quantization.
+    Draco snaps each primitive to a grid of 2**bits - 1 steps over its largest
+    bounding-box extent. Vertices keep their connectivity, so this bounds the
+    Hausdorff distance to the source. Per-object boxes make it an upper bound
+    for multi-material meshes."""
+    worst = 0.0
+    steps = 2 ** bits - 1
+    for obj in objects:
+        if not obj.data.vertices:
+            continue
+        co = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+        obj.data.vertices.foreach_get('co', co)
+        co = co.reshape(-1, 3)
+        low = co.min(axis=0)
+        extent = (co.max(axis=0) - low).max()
+        if extent == 0:
+            continue
+        step = extent / steps
+        snapped = np.floor((co - low) / step + 0.5) * step + low
+        displacement = (snapped - co) @ np.array(obj.matrix_world)[:3, :3].T
+        worst = max(worst, float(np.sqrt((displacement ** 2).sum(axis=1)).max()))
+    return worst
+
+def search_position_bits(objects, budget):
+    """Fewest position bits (smallest output) whose error stays within budget"""
+    for bits in POSITION_BITS:
+        error = quantization_error(objects, bits)
+        if error <= budget:
+            return bits, error
+    return bits, error
+
+def estimated_bytes(mesh):
+    """Uncompressed glTF payload estimate: position, normal, 2D UVs and RGBA
+    colours per vertex plus 32-bit triangle indices"""
+    vertex_bytes = 24 + 8 * len(mesh.uv_layers) + 16 * len(mesh.color_attributes)
+    triangles = len(mesh.loops) - 2 * len(mesh.polygons)
+    return len(mesh.vertices) * vertex_bytes + triangles * 12
+
+def triangle_count(mesh):
+    return len(mesh.loops) - 2 * len(mesh.polygons)
 
-def export_collection_to_glb(collection_name, output_path, decimate_ratio=None):
-    """Export a specific collection to GLB"""
+def is_tube(obj):
+    """Round-beveled curve (nerve, vessel) that evaluates to a tube mesh"""
+    return obj.type == 'CURVE' and obj.data.bevel_mode == 'ROUND' and obj.data.bevel_depth > 0
+
+def adaptive_tube(obj, feature_size, collection):
+    """Temporary copy of a tube curve with bevel and curve resolution for feature_size
+
+    Around the tube, sides shorter than feature_size are not visible. Along it,
+    segments need not be shorter than the tube's diameter (it cannot bend tighter)
+    or feature_size. Resolutions are never raised above the source's.
+    """
+    curve = obj.data.copy()
+    points = [p for spline in curve.splines for p in (spline.bezier_points or spline.points)]
+    scale = sum(obj.matrix_world.to_scale()) / 3
+    radius = curve.bevel_depth * scale * (sum(p.radius for p in points) / len(points) if points else 1.0)
+    
+    # a round bevel has 4 + 2 * bevel_resolution sides
+    sides = max(4, math.ceil(2 * math.pi * radius / feature_size))
+    curve.bevel_resolution = min(curve.bevel_resolution, math.ceil((sides - 4) / 2))
+    
+    spans = []
+    for spline in curve.splines:
+        co = [p.co.xyz for p in (spline.bezier_points or spline.points)]
+        spans += [(b - a).length * scale for a, b in zip(co, co[1:])]
+    if spans:
+        segment = max(feature_size, 2 * radius)
+        curve.resolution_u = max(1, min(curve.resolution_u, math.ceil(sum(spans) / len(spans) / segment)))
+    
+    tube = bpy.data.objects.new(obj.name + "~tube", curve)
+    tube.matrix_world = obj.matrix_world
+    collection.objects.link(tube)
+    return tube
+
+def world_triangles(mesh, matrix_world):
+    """(n, 3) world-space vertex positions and (m, 3) triangle indices of a mesh"""
+    mesh.calc_loop_triangles()
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    matrix = np.array(matrix_world)
+    co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    triangles = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', triangles)
+    return co, triangles.reshape(-1, 3)
+
+def mesh_arrays(mesh):
+    """Vertex positions, loop vertices, polygon sizes and edges as arrays"""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', co)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loop_vertices)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('loop_total', loop_totals)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edges)
+    return co.reshape(-1, 3), loop_vertices, loop_totals, edges.reshape(-1, 2)
+
+def weld_mesh(mesh, distance):
+    """Merge vertices closer than distance and drop deform weights (the static exports have no armatures)"""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=distance)
+    for layer in bm.verts.layers.deform.values():
+        bm.verts.layers.deform.remove(layer)
+    bm.to_mesh(mesh)
+    bm.free()
+
+def analyze_mesh(co, loop_vertices, loop_totals, edges, distance):
+    """What to delete in a welded mesh, from its arrays
+
+    Returns (degenerate polygons, loose edges, loose vertices).
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(co) == 0:
+        return empty, empty, empty
+    
+    loops = loop_vertices.astype(np.int64)
+    used = np.zeros(len(co), dtype=bool)
+    degenerate = face_keys = empty
+    if len(loop_totals):
+        poly_index = np.repeat(np.arange(len(loop_totals)), loop_totals)
+        starts = np.cumsum(loop_totals) - loop_totals
+        following = np.arange(len(loops)) + 1
+        following[starts + loop_totals - 1] = starts
+        
+        # fewer than 3 distinct vertices, or no area (fan triangulation)
+        distinct = np.bincount(np.unique(poly_index * len(co) + loops) // len(co), minlength=len(loop_totals))
+        points = co[loops]
+        origin = points[np.repeat(starts, loop_totals)]
+        cross = np.cross(points - origin, points[following] - origin)
+        area = np.linalg.norm(np.add.reduceat(cross, starts), axis=1) / 2
+        degenerate = np.flatnonzero((distinct < 3) | (area <= distance ** 2))
+        
+        kept = np.ones(len(loop_totals), dtype=bool)
+        kept[degenerate] = False
+        kept_loops = kept[poly_index]
+        used[loops[kept_loops]] = True
+        a = loops[kept_loops]
+        b = loops[following[kept_loops]]
+        face_keys = np.minimum(a, b) * len(co) + np.maximum(a, b)
+    
+    edge_keys = edges.min(axis=1).astype(np.int64) * len(co) + edges.max(axis=1)
+    loose_edges = np.flatnonzero(~np.isin(edge_keys, face_keys))
+    loose_vertices = np.flatnonzero(~used)
+    return degenerate, loose_edges, loose_vertices
+
+def map_workers(func, jobs, workers):
+    """func over jobs in forked worker processes, serially where fork is unavailable"""
+    if workers and workers > 1 and len(jobs) > 1 and "fork" in multiprocessing.get_all_start_methods():
+        with multiprocessing.get_context("fork").Pool(min(workers, len(jobs))) as pool:
+            return pool.map(func, jobs)
+    return [func(job) for job in jobs]
+
+def apply_cleanup(mesh, degenerate, loose_edges, loose_vertices):
+    """Delete with bmesh, elements removed by an earlier step are skipped"""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    for elements in (bm.verts, bm.edges, bm.faces):
+        elements.ensure_lookup_table()
+    faces = [bm.faces[i] for i in degenerate]
+    edges = [bm.edges[i] for i in loose_edges]
+    verts = [bm.verts[i] for i in loose_vertices]
+    bmesh.ops.delete(bm, geom=[f for f in faces if f.is_valid], context='FACES')
+    bmesh.ops.delete(bm, geom=[e for e in edges if e.is_valid], context='EDGES')
+    bmesh.ops.delete(bm, geom=[v for v in verts if v.is_valid], context='VERTS')
+    bm.to_mesh(mesh)
+    bm.free()
+
+def used_attribute_names(materials):
+    """UV maps and colour/generic attributes referenced by material nodes"""
+    names = set()
+    for material in materials:
+        if material and material.node_tree:
+            for node in material.node_tree.nodes:
+                for prop in ("uv_map", "layer_name", "attribute_name"):
+                    value = getattr(node, prop, "")
+                    if value:
+                        names.add(value)
+    return names
+
+def prune_mesh(mesh):
+    """Remove UV maps, colour attributes and material slots nothing uses"""
+    used = used_attribute_names(mesh.materials)
+    # image textures without an explicit UV map read the active render UV map
+    unused_uvs = [uv.name for uv in mesh.uv_layers if uv.name not in used and not uv.active_render]
+    for name in unused_uvs:
+        mesh.uv_layers.remove(mesh.uv_layers[name])
+    unused_colors = [color.name for color in mesh.color_attributes if color.name not in used]
+    for name in unused_colors:
+        mesh.color_attributes.remove(mesh.color_attributes[name])
+    
+    indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get('material_index', indices)
+    used_slots = set(np.unique(indices).tolist())
+    # highest first, popping a slot shifts the polygons' indices above it
+    for index in reversed(range(len(mesh.materials))):
+        if index not in used_slots:
+            mesh.materials.pop(index=index)
+
+def cleanup_meshes(copies, distance):
+    """Clean up the copies' meshes (shared meshes once), returns the estimated bytes saved
+
+    Runs in this process: the bmesh weld and deletes need bpy, and shipping the
+    meshes to worker processes and back costs more than the numpy analysis saves.
+    """
+    meshes = {}
+    for copy in copies:
+        copy.vertex_groups.clear()  # the weights themselves are on the mesh, see weld_mesh
+        meshes.setdefault(copy.data.name, copy.data)
+    meshes = list(meshes.values())
+    
+    before = sum(estimated_bytes(mesh) for mesh in meshes)
+    for mesh in meshes:
+        weld_mesh(mesh, distance)
+        apply_cleanup(mesh, *analyze_mesh(*mesh_arrays(mesh), distance))
+        prune_mesh(mesh)
+    return before - sum(estimated_bytes(mesh) for mesh in meshes)
+
+@contextmanager
+def export_copies(objects, decimate_ratio=None, mirror_tolerance=None, cleanup=None, curve_feature_size=None):
+    """Modifier-applied copies of objects in a temporary collection
+    
+    The copies take over the source objects' names for the duration of the
+    export (glTF node names must stay the Z-Anatomy names), the sources are
+    renamed back and nothing in the source data is modified.
+    With mirror_tolerance, mirrored .l/.r copies share one mesh.
+    With cleanup (merge distance), the meshes are cleaned up before decimation.
+    With curve_feature_size, tube curves are meshed at resolutions for that size.
+    """
+    temp = bpy.data.collections.new("_export")
+    bpy.context.scene.collection.children.link(temp)
+    renamed = []
+    copies = []
+    meshes = []
+    curves = []
+    try:
+        tubes = {}
+        if curve_feature_size is not None:
+            for obj in objects:
+                if is_tube(obj):
+                    tubes[obj] = adaptive_tube(obj, curve_feature_size, temp)
+                    curves.append(tubes[obj].data)
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        
+        triangles_before = triangles_after = 0
+        for obj in objects:
+            if obj in tubes:
+                evaluated = obj.evaluated_get(depsgraph)
+                triangles_before += triangle_count(evaluated.to_mesh())
+                evaluated.to_mesh_clear()
+            mesh = bpy.data.meshes.new_from_object(tubes.get(obj, obj).evaluated_get(depsgraph))
+            if obj in tubes:
+                triangles_after += triangle_count(mesh)
+            meshes.append(mesh)
+            copy = bpy.data.objects.new(obj.name, mesh)
+            copy.matrix_world = obj.matrix_world
+            temp.objects.link(copy)
+            copies.append(copy)
+            
+            # a short placeholder, name + suffix could be cut at the 63-byte name limit
+            name = obj.name
+            obj.name = f"~{len(renamed)}"
+            renamed.append((obj, name))
+            copy.name = name
+            assert copy.name == name, f"{name!r} is still taken, the copy became {copy.name!r}"
+            copy['source_data'] = obj.data.name
+        
+        if tubes:
+            print(f"  〰️  {len(tubes)} tubes: {triangles_before:,} → {triangles_after:,} triangles")
+        
+        # pairs are matched before decimation, decimated halves would no longer match
+        if mirror_tolerance is not None:
+            saved = instance_mirrored_pairs(copies, mirror_tolerance)
+            print(f"  🪞 Mirrored pairs share meshes: {saved:,} vertices not duplicated")
+        
+        if cleanup is not None:
+            saved = cleanup_meshes(copies, cleanup)
+            print(f"  🧹 Cleanup: ~{saved / (1024 * 1024):.2f} MB of vertex/index data saved")
+        
+        if decimate_ratio and decimate_ratio < 1.0:
+            for copy in copies:
+                mod = copy.modifiers.new(name='Decimate', type='DECIMATE')
+                mod.ratio = decimate_ratio
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            decimated_meshes = {}  # shared (mirrored) meshes are decimated once
+            for copy in copies:
+                old_mesh = copy.data
+                if old_mesh.name not in decimated_meshes:
+                    decimated_meshes[old_mesh.name] = bpy.data.meshes.new_from_object(copy.evaluated_get(depsgraph))
+                    meshes.append(decimated_meshes[old_mesh.name])
+                copy.data = decimated_meshes[old_mesh.name]
+                copy.modifiers.clear()
+                if old_mesh.users == 0:
+                    bpy.data.meshes.remove(old_mesh)
+        
+        yield copies
+    finally:
+        for copy in temp.all_objects[:]:
+            bpy.data.objects.remove(copy, do_unlink=True)
+        for mesh in meshes:
+            try:
+                if mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+            except ReferenceError:
+                pass  # already removed (decimated or joined away)
+        for curve in curves:
+            bpy.data.curves.remove(curve)
+        bpy.data.collections.remove(temp)
+        for obj, name in renamed:
+            obj.name = name
+
+def merge_by_material(copies, part_ids):
+    """Join copies sharing the same materials, tagging every vertex with its part index
+    
+    Returns the merged objects and the part table (index -> partId).
+    """
+    groups = {}
+    for copy in copies:
+        key = tuple(slot.material.name if slot.material else "" for slot in copy.material_slots)
+        groups.setdefault(key, []).append(copy)
+    
+    parts = []
+    merged = []
+    for key, group in groups.items():
+        for copy in group:
+            index = len(parts)
+            parts.append(part_ids.get(copy['source_data'], copy['source_data']))
+            # bake the world transform, the merged primitive sits at the origin
+            copy.data.transform(copy.matrix_world)
+            copy.matrix_world = Matrix.Identity(4)
+            # float attribute: integers are exact up to 2^24 and every glTF reader supports it
+            attribute = copy.data.attributes.new("_PART_ID", 'FLOAT', 'POINT')
+            attribute.data.foreach_set('value', [float(index)] * len(copy.data.vertices))
+        
+        with bpy.context.temp_override(active_object=group[0], selected_editable_objects=group):
+            bpy.ops.object.join()
+        group[0].name = f"{key[0] or 'Unassigned'} (merged)"
+        merged.append(group[0])
+    return merged, parts
+
+# Picking proxies: the convex hull when it fills out the part, a decimated mesh otherwise
+PICK_HULL_FILL = 0.5  # min part volume / hull volume for the hull
+PICK_TRIANGLES = 256  # triangle budget of a decimated proxy
+
+def morton_order(points):
+    """Indices ordering points along a Z-order curve, spatial neighbours stay adjacent"""
+    low = points.min(axis=0)
+    span = (points.max(axis=0) - low).max() or 1.0
+    cells = ((points - low) / span * 1023).astype(np.int64)
+    code = np.zeros(len(points), dtype=np.int64)
+    for bit in range(10):
+        for axis in range(3):
+            code |= ((cells[:, axis] >> bit) & 1) << (3 * bit + axis)
+    return np.argsort(code, kind='stable')
+
+def picking_proxy(copy):
+    """Low-poly stand-in mesh for a copy, in its local space"""
+    bm = bmesh.new()
+    bm.from_mesh(copy.data)
+    volume = abs(bm.calc_volume())
+    hull = bmesh.new()
+    for vert in bm.verts:
+        hull.verts.new(vert.co)
+    bm.free()
+    bmesh.ops.convex_hull(hull, input=hull.verts[:])
+    # points inside the hull are left loose
+    bmesh.ops.delete(hull, geom=[v for v in hull.verts if not v.link_faces], context='VERTS')
+    
+    if volume >= PICK_HULL_FILL * abs(hull.calc_volume()):
+        proxy = bpy.data.meshes.new(copy.data.name + " hull")
+        hull.to_mesh(proxy)
+    else:
+        mod = copy.modifiers.new(name='Decimate', type='DECIMATE')
+        mod.ratio = min(1.0, PICK_TRIANGLES / max(1, triangle_count(copy.data)))
+        proxy = bpy.data.meshes.new_from_object(copy.evaluated_get(bpy.context.evaluated_depsgraph_get()))
+        copy.modifiers.remove(mod)
+    hull.free()
+    return proxy
+
+def export_picking_proxies(collection_name, output_path, part_ids):
+    """Write one GLB with a picking proxy per part, joined into a single mesh
+
+    Parts follow a Z-order curve of their centres, so the triangles of nearby
+    parts are contiguous and a BVH built over the mesh splits cleanly. Each
+    vertex carries its part index (_PART_ID, table in the manifest).
+    """
+    collection = bpy.data.collections.get(collection_name)
+    if collection is None:
+        return False
+    objects = [obj for obj in collection.objects if obj.type == 'MESH' or is_tube(obj)]
+    if not objects:
+        return False
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    proxies = []
+    with export_copies(objects, curve_feature_size=CURVE_FEATURE_SIZE["low"]) as copies:
+        try:
+            parts = []
+            pieces = []
+            for copy in copies:
+                proxy = picking_proxy(copy)
+                proxies.append(proxy)
+                co, triangles = world_triangles(proxy, copy.matrix_world)
+                if len(triangles) == 0:
+                    continue
+                parts.append(part_ids.get(copy['source_data'], copy['source_data']))
+                pieces.append((co, triangles))
+            if not pieces:
+                return False
+            
+            order = morton_order(np.array([co.mean(axis=0) for co, _ in pieces]))
+            vertices = []
+            faces = []
+            ids = []
+            offset = 0
+            for index in order:
+                co, triangles = pieces[index]
+                vertices.append(co)
+                faces.append(triangles + offset)
+                ids.append(np.full(len(co), index, dtype=np.float32))
+                offset += len(co)
+            
+            mesh = bpy.data.meshes.new("Picking proxies")
+            proxies.append(mesh)
+            mesh.from_pydata(np.concatenate(vertices).tolist(), [], np.concatenate(faces).tolist())
+            attribute = mesh.attributes.new("_PART_ID", 'FLOAT', 'POINT')
+            attribute.data.foreach_set('value', np.concatenate(ids))
+            
+            bpy.ops.object.select_all(action='DESELECT')
+            picking = bpy.data.objects.new("Picking proxies", mesh)
+            copies[0].users_collection[0].objects.link(picking)  # removed with the copies
+            picking.select_set(True)
+            # no Draco: proxies are small and need no decoder before the first pick
+            export_glb(output_path, draco=False, attributes=True)
+            update_manifest(output_path, mode="picking", partAttribute="_PART_ID", parts=parts)
+        finally:
+            for copy in copies:
+                copy.modifiers.clear()
+            for proxy in proxies:
+                bpy.data.meshes.remove(proxy)
+    
+    triangles = sum(len(faces) for _, faces in pieces)
+    print(f"🎯 Picking proxies: {output_path} ({len(parts)} parts, {triangles:,} triangles)")
+    return True
+
+# Exterior visibility: orthographic ray grids from a sphere of viewpoints, peeled layer by layer
+VISIBILITY_VIEWS = 64
+VISIBILITY_GRID = 64  # rays per side of a view's grid
+VISIBILITY_LAYERS = 4
+
+# state of the current layer, inherited by forked workers
+_visibility = {}
+
+def sphere_viewpoints(count):
+    """count unit directions evenly spread over a sphere (Fibonacci lattice)"""
+    i = np.arange(count) + 0.5
+    z = 1 - 2 * i / count
+    r = np.sqrt(1 - z * z)
+    phi = np.pi * (3 - np.sqrt(5)) * i
+    return np.column_stack((r * np.cos(phi), r * np.sin(phi), z))
+
+def cast_view(view):
+    """Ray hits per part for one viewpoint (runs in a worker process)"""
+    bvh, face_parts = _visibility["bvh"], _visibility["face_parts"]
+    centre, radius = _visibility["centre"], _visibility["radius"]
+    direction = -Vector(view)
+    u = direction.orthogonal().normalized()
+    v = direction.cross(u)
+    start = centre - direction * 2 * radius
+    hits = np.zeros(_visibility["parts"], dtype=np.int64)
+    for a, b in _visibility["grid"]:
+        location, normal, index, distance = bvh.ray_cast(start + u * a + v * b, direction, 4 * radius)
+        if index is not None:
+            hits[face_parts[index]] += 1
+    return hits
+
+def classify_visibility(pieces, workers):
+    """Occlusion rank and ray hits per piece (world vertices, triangles)
+
+    Rank 0 parts are hit from outside. They are then removed and the rays cast
+    again: rank 1 parts show once the outer layer is hidden, and so on. Parts
+    never hit get VISIBILITY_LAYERS.
+    """
+    points = np.concatenate([co for co, _ in pieces])
+    low, high = points.min(axis=0), points.max(axis=0)
+    centre = (low + high) / 2
+    radius = float(np.linalg.norm(high - low) / 2) or 1.0
+    offsets = np.linspace(-radius, radius, VISIBILITY_GRID)
+    grid = [(a, b) for a in offsets for b in offsets if a * a + b * b <= radius * radius]
+    views = [tuple(view) for view in sphere_viewpoints(VISIBILITY_VIEWS)]
+    
+    rank = np.full(len(pieces), VISIBILITY_LAYERS)
+    hits = np.zeros(len(pieces), dtype=np.int64)
+    remaining = np.arange(len(pieces))
+    for layer in range(VISIBILITY_LAYERS):
+        vertices = []
+        faces = []
+        face_parts = []
+        offset = 0
+        for index in remaining:
+            co, triangles = pieces[index]
+            vertices.append(co)
+            faces.append(triangles + offset)
+            face_parts.append(np.full(len(triangles), index))
+            offset += len(co)
+        _visibility.update(
+            bvh=BVHTree.FromPolygons(np.concatenate(vertices).tolist(), np.concatenate(faces).tolist(), all_triangles=True),
+            face_parts=np.concatenate(face_parts), parts=len(pieces),
+            centre=Vector(centre.tolist()), radius=radius, grid=grid)
+        layer_hits = sum(map_workers(cast_view, views, workers))
+        
+        seen = remaining[layer_hits[remaining] > 0]
+        rank[seen] = layer
+        hits[seen] = layer_hits[seen]
+        remaining = remaining[layer_hits[remaining] == 0]
+        if not len(seen) or not len(remaining):
+            break
+    _visibility.clear()
+    return rank, hits
+
+def export_visibility(collection_name, output_path, part_ids, workers):
+    """Write [partId, occlusion rank, ray hits] per part, outermost and most visible first"""
+    collection = bpy.data.collections.get(collection_name)
+    if collection is None:
+        return False
+    objects = [obj for obj in collection.objects if obj.type == 'MESH' or is_tube(obj)]
+    if not objects:
+        return False
+    
+    parts = []
+    pieces = []
+    with export_copies(objects, curve_feature_size=CURVE_FEATURE_SIZE["low"]) as copies:
+        for copy in copies:
+            co, triangles = world_triangles(copy.data, copy.matrix_world)
+            if len(triangles):
+                parts.append(part_ids.get(copy['source_data'], copy['source_data']))
+                pieces.append((co, triangles))
+    if not pieces:
+        return False
+    
+    rank, hits = classify_visibility(pieces, workers)
+    rows = sorted(zip(parts, rank.tolist(), hits.tolist()), key=lambda row: (row[1], -row[2], row[0]))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump({
+            "views": VISIBILITY_VIEWS,
+            "raysPerView": VISIBILITY_GRID * VISIBILITY_GRID,
+            "columns": ["partId", "rank", "hits"],
+            "rows": rows,
+        }, f, separators=(',', ':'))
+    exterior = int((rank == 0).sum())
+    print(f"👁️  Visibility: {output_path} ({exterior}/{len(parts)} parts seen from outside)")
+    return True
+
+# Region shards: parts with geometry inside a region's (padded) bounding box
+REGIONS_COLLECTION = "Regions of human body"
+REGION_PADDING = 0.02
+
+def region_volumes():
+    """{region name: (low, high)} world bounding boxes of the region meshes"""
+    collection = next((c for c in bpy.data.collections
+                       if c.get('English', c.name).lstrip('.').split(': ')[-1] == REGIONS_COLLECTION), None)
+    if collection is None:
+        print(f"⚠️  No '{REGIONS_COLLECTION}' collection found")
+        return {}
+    regions = {}
+    for obj in collection.all_objects:
+        if obj.type != 'MESH' or not obj.data.vertices:
+            continue
+        co = world_vertices(obj)
+        regions[obj.data.name] = (co.min(axis=0) - REGION_PADDING, co.max(axis=0) + REGION_PADDING)
+    return regions
+
+def in_region(obj, low, high):
+    """True when any vertex of a mesh (bounding-box corner of a curve) lies in the box"""
+    if obj.type == 'MESH':
+        co = world_vertices(obj)
+    else:
+        matrix = np.array(obj.matrix_world)
+        co = np.array([tuple(corner) for corner in obj.bound_box]) @ matrix[:3, :3].T + matrix[:3, 3]
+    return bool(np.all((co >= low) & (co <= high), axis=1).any())
+
+def region_slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+def gltf_bounds(low, high):
+    """Blender box as a glTF (Y up) [min, max] box"""
+    return [[round(low[0], 4), round(low[2], 4), round(-high[1], 4)],
+            [round(high[0], 4), round(high[2], 4), round(-low[1], 4)]]
+
+def export_region_shards(systems, options):
+    """Export every system cut by every region, and regions/index.json listing the shards"""
+    index = {}
+    for name, (low, high) in sorted(region_volumes().items()):
+        slug = region_slug(name)
+        shards = {}
+        for collection_name, output_dir, filename in systems:
+            collection = bpy.data.collections.get(collection_name)
+            if collection is None:
+                continue
+            objects = [obj for obj in collection.objects
+                       if (obj.type == 'MESH' or is_tube(obj)) and in_region(obj, low, high)]
+            if not objects:
+                continue
+            output_path = f"{OUTPUT_DIR}/regions/{slug}/{filename}.glb"
+            if export_collection_to_glb(collection_name, output_path, objects=objects, **options):
+                shards[output_dir] = {
+                    "file": os.path.relpath(output_path, OUTPUT_DIR),
+                    "bytes": os.path.getsize(output_path),
+                    "parts": len(objects),
+                }
+        if shards:
+            index[slug] = {"name": name, "bounds": gltf_bounds(low, high), "shards": shards}
+    
+    index_path = f"{OUTPUT_DIR}/regions/index.json"
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    print(f"🗺️  Region index: {index_path} ({len(index)} regions)")
+
+# Section planes: axis and fraction of the body's bounding box along it.
+# The side the normal (+X, +Y, +Z in Blender) points to is cut away.
+SECTION_AXES = {"sagittal": 0, "coronal": 1, "transverse": 2}
+DEFAULT_SECTIONS = ["sagittal:0.5", "coronal:0.5", "transverse:0.25", "transverse:0.5", "transverse:0.75"]
+
+def body_bounds(systems):
+    """World bounding box of all system objects"""
+    corners = []
+    for collection_name, _, _ in systems:
+        collection = bpy.data.collections.get(collection_name)
+        for obj in collection.all_objects if collection else []:
+            if obj.type == 'MESH' or is_tube(obj):
+                matrix = np.array(obj.matrix_world)
+                corners.append(np.array([tuple(c) for c in obj.bound_box]) @ matrix[:3, :3].T + matrix[:3, 3])
+    corners = np.concatenate(corners)
+    return corners.min(axis=0), corners.max(axis=0)
+
+def section_part(copy, point, normal):
+    """Clip a copy at a world plane, keeping the side behind the normal
+
+    Returns the cap mesh closing the cut (facing along the normal), or None.
+    A copy entirely in front of the plane is left without geometry.
+    """
+    copy.data.transform(copy.matrix_world)
+    copy.matrix_world = Matrix.Identity(4)
+    bm = bmesh.new()
+    bm.from_mesh(copy.data)
+    result = bmesh.ops.bisect_plane(bm, geom=bm.verts[:] + bm.edges[:] + bm.faces[:],
+                                    plane_co=point, plane_no=normal, clear_outer=True)
+    bm.to_mesh(copy.data)
+    
+    cap_bm = bmesh.new()
+    verts = {}
+    for edge in result['geom_cut']:
+        if isinstance(edge, bmesh.types.BMEdge) and edge.is_valid:
+            ends = []
+            for vert in edge.verts:
+                if vert not in verts:
+                    verts[vert] = cap_bm.verts.new(vert.co)
+                ends.append(verts[vert])
+            cap_bm.edges.new(ends)
+    bm.free()
+    # scanfill keeps holes (marrow cavities, lumens) open
+    bmesh.ops.triangle_fill(cap_bm, use_beauty=True, use_dissolve=False, edges=cap_bm.edges[:], normal=normal)
+    cap = None
+    if cap_bm.faces:
+        cap_bm.normal_update()
+        for face in cap_bm.faces:
+            if face.normal.dot(normal) < 0:
+                face.normal_flip()
+        cap = bpy.data.meshes.new(copy.data.name + " cap")
+        cap_bm.to_mesh(cap)
+    cap_bm.free()
+    return cap
+
+def export_section(collection_name, output_path, point, normal):
+    """Export a system clipped at a plane with its caps, returns (parts, cap triangles) or None"""
+    collection = bpy.data.collections.get(collection_name)
+    if collection is None:
+        return None
+    objects = [obj for obj in collection.objects if obj.type == 'MESH' or is_tube(obj)]
+    if not objects:
+        return None
+    
+    caps = []
+    parts = 0
+    with export_copies(objects) as copies:
+        try:
+            bpy.ops.object.select_all(action='DESELECT')
+            temp = copies[0].users_collection[0]
+            for copy in copies:
+                cap = section_part(copy, point, normal)
+                if not copy.data.polygons:
+                    continue
+                parts += 1
+                copy.select_set(True)
+                if cap is not None:
+                    caps.append(cap)
+                    if copy.data.materials:
+                        cap.materials.append(copy.data.materials[0])
+                    cap_object = bpy.data.objects.new(copy.name + " cap", cap)
+                    temp.objects.link(cap_object)  # removed with the copies
+                    cap_object.select_set(True)
+            if not parts:
+                return None
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            export_glb(output_path)
+            cap_triangles = sum(len(cap.polygons) for cap in caps)
+        finally:
+            for cap in caps:
+                bpy.data.meshes.remove(cap)
+    return parts, cap_triangles
+
+def export_sections(systems, specs):
+    """Export every system clipped at every plane, and sections/index.json listing them"""
+    low, high = body_bounds(systems)
+    index = {}
+    for spec in specs:
+        axis_name, fraction = spec.split(":")
+        axis = SECTION_AXES[axis_name]
+        fraction = float(fraction)
+        point = Vector((low + (high - low) * 0.5).tolist())
+        point[axis] = float(low[axis] + (high[axis] - low[axis]) * fraction)
+        normal = Vector([1.0 if i == axis else 0.0 for i in range(3)])
+        plane = f"{axis_name}-{fraction:.2f}"
+        
+        shards = {}
+        for collection_name, output_dir, filename in systems:
+            output_path = f"{OUTPUT_DIR}/sections/{plane}/{filename}.glb"
+            result = export_section(collection_name, output_path, point, normal)
+            if result:
+                parts, cap_triangles = result
+                shards[output_dir] = {
+                    "file": os.path.relpath(output_path, OUTPUT_DIR),
+                    "bytes": os.path.getsize(output_path),
+                    "parts": parts,
+                    "capTriangles": cap_triangles,
+                }
+                print(f"🔪 {plane}: {output_path} ({parts} parts, {cap_triangles:,} cap triangles)")
+        index[plane] = {
+            "axis": axis_name,
+            "fraction": fraction,
+            # glTF space, the kept side is behind the normal
+            "point": gltf_co(point),
+            "normal": gltf_co(normal),
+            "shards": shards,
+        }
+    
+    index_path = f"{OUTPUT_DIR}/sections/index.json"
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    with open(index_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    print(f"🗂️  Section index: {index_path} ({len(index)} planes)")
+
+def export_collection_to_glb(collection_name, output_path, decimate_ratio=None, merge=False, part_ids=None,
+                             mirror_tolerance=None, dual_codec=False, draco_settings=None, error_budget=None,
+                             cleanup=None, curve_feature_size=CURVE_FEATURE_SIZE["high"], objects=None):
+    """Export a specific collection to GLB (only objects, when given)"""
     try:
         # Deselect all
         bpy.ops.object.select_all(action='DESELECT')
@@ -20,41 +1088,52 @@ def export_collection_to_glb(collection_name, output_path, decimate_ratio=None):
         if collection_name in bpy.data.collections:
             collection = bpy.data.collections[collection_name]
             
-            # Count meshes
-            mesh_count = sum(1 for obj in collection.objects if obj.type == 'MESH')
+            # Count meshes (nerves and vessels are tube curves, exported as meshes)
+            meshes = objects if objects is not None else [obj for obj in collection.objects if obj.type == 'MESH' or is_tube(obj)]
+            mesh_count = len(meshes)
             if mesh_count == 0:
                 print(f"⚠️  Skipping {collection_name}: No meshes found")
                 return False
             
-            for obj in collection.objects:
-                if obj.type == 'MESH':
-                    obj.select_set(True)
-            
-            # Apply decimation if requested (for LOD)
-            if decimate_ratio and decimate_ratio < 1.0:
-                for obj in bpy.context.selected_objects:
-                    if obj.type == 'MESH':
-                        mod = obj.modifiers.new(name='Decimate', type='DECIMATE')
-                        mod.ratio = decimate_ratio
-                        bpy.context.view_layer.objects.active = obj
-                        bpy.ops.object.modifier_apply(modifier='Decimate')
-            
             # Ensure directory exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Export selected to GLB
-            bpy.ops.export_scene.gltf(
-                filepath=output_path,
-                use_selection=True,
-                export_format='GLB',
-                export_draco_mesh_compression_enable=True,
-                export_draco_mesh_compression_level=6,
-                export_apply=True,
-                export_yup=True
-            )
+            # Decimation (for LOD) and merging happen on copies, never on the source
+            # mirrored instances cannot be joined into merged primitives
+            with export_copies(meshes, decimate_ratio, None if merge else mirror_tolerance, cleanup, curve_feature_size) as copies:
+                if merge:
+                    copies, parts = merge_by_material(copies, part_ids or {})
+                    update_manifest(output_path, mode="merged", partAttribute="_PART_ID", parts=parts)
+                else:
+                    # a part table from an earlier merged export would not match this GLB
+                    update_manifest(output_path, mode=None, partAttribute=None, parts=None)
+                
+                for obj in copies:
+                    obj.select_set(True)
+                
+                # Draco position bits: searched, recorded by an earlier search, or the default
+                settings = draco_settings if draco_settings is not None else {}
+                key = os.path.relpath(output_path, OUTPUT_DIR)
+                if error_budget is not None:
+                    bits, error = search_position_bits(copies, error_budget)
+                    settings[key] = {"positionBits": bits, "maxError": error, "errorBudget": error_budget}
+                    print(f"  🎯 {bits} position bits, max error {error * 1000:.3f} mm")
+                position_bits = settings.get(key, {}).get("positionBits", DEFAULT_POSITION_BITS)
+                
+                # Export selected to GLB
+                if dual_codec:
+                    export_variants(output_path, attributes=merge, position_bits=position_bits)
+                else:
+                    export_glb(output_path, attributes=merge, position_bits=position_bits)
+                    drop_variants(output_path)
+                if key in settings:
+                    settings[key]["bytes"] = os.path.getsize(output_path)
             
             file_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
-            print(f"✅ Exported: {output_path} ({file_size:.1f} MB, {mesh_count} meshes)")
+            if merge:
+                print(f"✅ Exported: {output_path} ({file_size:.1f} MB, {mesh_count} meshes in {len(copies)} primitives)")
+            else:
+                print(f"✅ Exported: {output_path} ({file_size:.1f} MB, {mesh_count} meshes)")
             
             # Deselect all
             bpy.ops.object.select_all(action='DESELECT')
@@ -67,37 +1146,34 @@ def export_collection_to_glb(collection_name, output_path, decimate_ratio=None):
         print(f"❌ Error exporting {collection_name}: {e}")
         return False
 
-def main():
-    print("\n🎨 Exporting Z-Anatomy Main Systems to GLB")
-    print("=" * 70)
-    
-    # Main anatomical systems with their collection names
-    systems = [
-        # (collection_name, output_directory, output_filename)
-        ("1: Skeletal system", "skeleton", "skeleton-full"),
-        ("4: Muscular system", "muscular", "muscles-full"),
-        ("5: Cardiovascular system", "cardiovascular", "cardiovascular-full"),
-        ("7: Nervous system & Sense organs", "nervous", "nervous-full"),
-        ("8: Visceral systems", "respiratory", "visceral-full"),
-    ]
-    
-    # Export high-quality versions
+def export_high(systems, options, args):
+    """Full-detail files and everything derived from the full-detail atlas"""
     print("\n📦 Exporting HIGH quality versions...")
     for collection_name, output_dir, filename in systems:
         output_path = f"{OUTPUT_DIR}/{output_dir}/{filename}.glb"
-        export_collection_to_glb(collection_name, output_path)
+        export_collection_to_glb(collection_name, output_path, **options)
     
-    # Export medium-quality LOD versions
-    print("\n📦 Exporting MEDIUM quality LOD versions...")
+    # Label tables are shared by all LODs of a system
+    print("\n📦 Exporting label tables...")
+    part_ids = options["part_ids"] or load_part_ids()
     for collection_name, output_dir, filename in systems:
-        output_path = f"{OUTPUT_DIR}/{output_dir}/{filename}-med.glb"
-        export_collection_to_glb(collection_name, output_path, decimate_ratio=0.5)
+        export_label_table(collection_name, f"{OUTPUT_DIR}/{output_dir}/{filename}.labels.json", part_ids)
     
-    # Export low-quality LOD versions
-    print("\n📦 Exporting LOW quality LOD versions...")
+    print("\n📦 Exporting picking proxies...")
     for collection_name, output_dir, filename in systems:
-        output_path = f"{OUTPUT_DIR}/{output_dir}/{filename}-low.glb"
-        export_collection_to_glb(collection_name, output_path, decimate_ratio=0.2)
+        export_picking_proxies(collection_name, f"{OUTPUT_DIR}/{output_dir}/{filename}-pick.glb", part_ids)
+    
+    print("\n📦 Classifying exterior visibility...")
+    for collection_name, output_dir, filename in systems:
+        export_visibility(collection_name, f"{OUTPUT_DIR}/{output_dir}/{filename}.visibility.json", part_ids, args.workers)
+    
+    if args.regions:
+        print("\n📦 Exporting region shards...")
+        export_region_shards(systems, options)
+    
+    if args.sections:
+        print("\n📦 Exporting cross-sections...")
+        export_sections(systems, args.section or DEFAULT_SECTIONS)
     
     # Export some specific organs
     print("\n📦 Exporting specific organs...")
@@ -117,18 +1193,65 @@ def main():
                 output_path = f"{OUTPUT_DIR}/{output_dir}/{filename}.glb"
                 os.makedirs(os.path.dirname(output_path), exist_ok=True)
                 
-                bpy.ops.export_scene.gltf(
-                    filepath=output_path,
-                    use_selection=True,
-                    export_format='GLB',
-                    export_draco_mesh_compression_enable=True,
-                    export_draco_mesh_compression_level=6,
-                    export_apply=True,
-                    export_yup=True
-                )
+                if options["dual_codec"]:
+                    export_variants(output_path)
+                else:
+                    export_glb(output_path)
+                    drop_variants(output_path)
                 
                 file_size = os.path.getsize(output_path) / (1024 * 1024)
                 print(f"✅ Exported: {output_path} ({file_size:.1f} MB)")
+
+def main():
+    args = parse_args()
+    options = {
+        "merge": args.merge_by_material,
+        "part_ids": load_part_ids() if args.merge_by_material else None,
+        "mirror_tolerance": args.mirror_tolerance if args.mirror_instances else None,
+        "dual_codec": args.dual_codec,
+        "draco_settings": load_draco_settings(),
+        "error_budget": args.error_budget if args.search_quantization else None,
+        "cleanup": args.cleanup_distance if args.cleanup else None,
+    }
+    
+    print("\n🎨 Exporting Z-Anatomy Main Systems to GLB")
+    print("=" * 70)
+    
+    # Main anatomical systems with their collection names
+    systems = [
+        # (collection_name, output_directory, output_filename)
+        ("1: Skeletal system", "skeleton", "skeleton-full"),
+        ("4: Muscular system", "muscular", "muscles-full"),
+        ("5: Cardiovascular system", "cardiovascular", "cardiovascular-full"),
+        ("7: Nervous system & Sense organs", "nervous", "nervous-full"),
+        ("8: Visceral systems", "respiratory", "visceral-full"),
+    ]
+    
+    lods = args.lod or LODS
+    
+    # Export high-quality versions
+    if "high" in lods:
+        export_high(systems, options, args)
+    
+    # Export medium-quality LOD versions
+    if "medium" in lods:
+        print("\n📦 Exporting MEDIUM quality LOD versions...")
+        for collection_name, output_dir, filename in systems:
+            output_path = f"{OUTPUT_DIR}/{output_dir}/{filename}-med.glb"
+            export_collection_to_glb(collection_name, output_path, decimate_ratio=0.5,
+                                     curve_feature_size=CURVE_FEATURE_SIZE["medium"], **options)
+    
+    # Export low-quality LOD versions
+    if "low" in lods:
+        print("\n📦 Exporting LOW quality LOD versions...")
+        for collection_name, output_dir, filename in systems:
+            output_path = f"{OUTPUT_DIR}/{output_dir}/{filename}-low.glb"
+            export_collection_to_glb(collection_name, output_path, decimate_ratio=0.2,
+                                     curve_feature_size=CURVE_FEATURE_SIZE["low"], **options)
+    
+    if args.search_quantization:
+        save_draco_settings(options["draco_settings"])
+        print(f"\n🎯 Draco settings recorded in {DRACO_SETTINGS_PATH}")
     
     print("\n" + "=" * 70)
     print("✨ Export complete!")
@@ -140,4 +1263,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -5,8 +5,87 @@ Usage: blender --background public/models/Z-Anatomy/Startup.blend --python scrip
 """
 
 import bpy
+import csv
+import hashlib
 import json
+import os
 import re
+import unicodedata
+
+# Output directory (relative to the repository, whatever the working directory)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+
+# Column names of the add-on's 'Translations' text block -> synonym language codes
+LANGUAGE_CODES = {
+    'English': 'en',
+    'Latin': 'la',
+    'Français': 'fr',
+    'Español': 'es',
+    'Portugues': 'pt',
+    'Nederlands': 'nl',
+    'Deutsch': 'de',
+    'Polski': 'pl',
+    '中國人': 'zh',
+}
+
+def clean_name(name):
+    """Strip Z-Anatomy side/label endings (same endings as the add-on's clean_name)"""
+    for ending in ('.r', '.l', '.t', '.st', '.r.t', '.l.t', '.g', '.j'):
+        if name.endswith(ending):
+            return name[:-len(ending)], ending
+    return name, ''
+
+def load_translations():
+    """English name -> {language code: name} from the 'Translations' text block"""
+    if 'Translations' not in bpy.data.texts:
+        print("⚠️  No 'Translations' text block, synonyms will be English only")
+        return {}
+
+    lines = bpy.data.texts['Translations'].as_string().splitlines()
+    languages = lines[0].split(';')
+    translations = {}
+    for line in lines[1:]:
+        names = line.split(';')
+        if not names or not names[0]:
+            continue
+        translations[names[0]] = {
+            LANGUAGE_CODES.get(lang, lang): name
+            for lang, name in zip(languages[1:], names[1:]) if name
+        }
+    return translations
+
+def normalize_term(term):
+    """Lowercase, strip accents and punctuation; the form search index keys use"""
+    term = unicodedata.normalize('NFKD', term.lower())
+    term = ''.join(c for c in term if not unicodedata.combining(c))
+    return re.sub(r'[\W_]+', ' ', term).strip()
+
+def build_search_index(ontology):
+    """Sorted term table for exact/prefix lookups (binary search) plus a trigram index for fuzzy ones
+
+    terms: [normalized term, part index, priority, language], sorted by term then priority
+    trigrams: trigram -> indices into terms
+    """
+    parts = [part["partId"] for part in ontology]
+    best = {}
+    for part_index, part in enumerate(ontology):
+        for syn in part["synonyms"]:
+            term = normalize_term(syn["synonym"])
+            if not term:
+                continue
+            key = (term, part_index)
+            if key not in best or best[key][2] < syn["priority"]:
+                best[key] = [term, part_index, syn["priority"], syn["language"]]
+
+    terms = sorted(best.values(), key=lambda t: (t[0], -t[2], t[1]))
+    trigrams = {}
+    for term_index, (term, _, _, _) in enumerate(terms):
+        padded = f"  {term} "
+        for gram in {padded[i:i+3] for i in range(len(padded) - 2)}:
+            trigrams.setdefault(gram, []).append(term_index)
+
+    return {"version": 1, "parts": parts, "terms": terms, "trigrams": dict(sorted(trigrams.items()))}
 
 def normalize_part_id(name):
     """Convert Z-Anatomy name to database partId format"""
@@ -43,11 +122,339 @@ def determine_system(collection_name, object_name):
     else:
         return 'SKELETAL'  # Default
 
+# Model path per system
+SYSTEM_PATHS = {
+    'SKELETAL': 'skeleton/skeleton-full.glb',
+    'MUSCULAR': 'muscular/muscles-full.glb',
+    'CARDIOVASCULAR': 'cardiovascular/cardiovascular-full.glb',
+    'NERVOUS': 'nervous/nervous-full.glb',
+    'RESPIRATORY': 'respiratory/visceral-full.glb',
+    'DIGESTIVE': 'respiratory/visceral-full.glb',
+}
+
+def collection_english_name(collection):
+    """English collection name without the layer number/dot prefix ("1: Skeletal system" -> "Skeletal system")"""
+    name = collection.get('English', collection.name)
+    return re.sub(r'^\d+:\s*', '', name).lstrip('.')
+
+def make_synonyms(name, eng_name, translations):
+    """Name, naive left/right variants and the translated names of eng_name"""
+    synonyms = [
+        {"synonym": name.lower(), "language": "en", "priority": 10}
+    ]
+    
+    # Add common English synonyms
+    if "left" in name.lower():
+        synonyms.append({
+            "synonym": name.lower().replace("left", "l").replace(".l", ""),
+            "language": "en",
+            "priority": 8
+        })
+    elif "right" in name.lower():
+        synonyms.append({
+            "synonym": name.lower().replace("right", "r").replace(".r", ""),
+            "language": "en",
+            "priority": 8
+        })
+    
+    # Add translated names (Translations is keyed by the English data-block name)
+    seen = {syn["synonym"] for syn in synonyms}
+    for language, translated in translations.get(eng_name, {}).items():
+        term = translated.lower()
+        if term in seen:
+            continue
+        seen.add(term)
+        synonyms.append({
+            "synonym": term,
+            "language": language,
+            "priority": 9 if language in ('en', 'la') else 7
+        })
+    return synonyms
+
+def assign_nested_sets(ontology):
+    """Return the parts in depth-first order with nested-set lft/rgt and depth
+
+    A subtree query ("all bones of the hand") becomes
+    lft > hand.lft AND rgt < hand.rgt, one range scan on the (lft, rgt) index.
+    """
+    children = {}
+    for part in ontology:
+        children.setdefault(part.get("parentId"), []).append(part)
+    
+    ordered = []
+    seen = set()
+    counter = 0
+    stack = [(part, 0, False) for part in reversed(children.get(None, []))]
+    while stack:
+        part, depth, visited = stack.pop()
+        if visited:
+            counter += 1
+            part["rgt"] = counter
+            continue
+        if part["partId"] in seen:
+            continue  # colliding partIds would otherwise make a cycle
+        seen.add(part["partId"])
+        counter += 1
+        part["lft"] = counter
+        part["depth"] = depth
+        ordered.append(part)
+        stack.append((part, depth, True))
+        stack.extend((child, depth + 1, False) for child in reversed(children.get(part["partId"], [])))
+    
+    if len(ordered) != len(ontology):
+        print(f"⚠️  {len(ontology) - len(ordered)} parts are not reachable from a root")
+    return ordered
+
+# Columns of the bulk-load CSVs, in Prisma column names
+PART_COLUMNS = ["id", "partId", "name", "latinName", "meshName", "system", "parentId", "lft", "rgt", "depth", "modelPath"]
+SYNONYM_COLUMNS = ["id", "partId", "synonym", "language", "priority"]
+NESTED_SET_COLUMNS = ["id", "lft", "rgt", "depth"]
+
+def stable_id(*keys):
+    """Deterministic primary key, the same part/synonym gets the same id on every run"""
+    return "za" + hashlib.sha1("\x1f".join(keys).encode()).hexdigest()[:23]
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def part_row(part):
+    """AnatomyPart CSV row (PART_COLUMNS)"""
+    parent_key = stable_id("part", part["parentId"]) if part.get("parentId") else None
+    return [
+        stable_id("part", part["partId"]), part["partId"], part["name"], part.get("latinName"), part.get("meshName"),
+        part["system"], parent_key, part.get("lft"), part.get("rgt"), part.get("depth"), part.get("modelPath"),
+    ]
+
+def synonym_rows(part):
+    """AnatomySynonym CSV rows (SYNONYM_COLUMNS) of a part"""
+    part_key = stable_id("part", part["partId"])
+    rows = []
+    seen = set()
+    for syn in part["synonyms"]:
+        key = (syn["synonym"], syn["language"])
+        if key in seen:  # (partId, synonym, language) is unique
+            continue
+        seen.add(key)
+        rows.append([stable_id("synonym", part["partId"], *key), part_key, *key, syn["priority"]])
+    return rows
+
+def write_csv(path, columns, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+def write_bulk_load(ontology, output_dir):
+    """Write COPY-ready CSVs per table, a checksum manifest and a psql load script"""
+    os.makedirs(output_dir, exist_ok=True)
+    
+    part_rows = [part_row(part) for part in ontology]
+    synonym_rows_ = [row for part in ontology for row in synonym_rows(part)]
+    
+    # table -> (file, columns, rows, timestamp columns filled in by the database)
+    tables = {
+        "AnatomyPart": ("anatomy_parts.csv", PART_COLUMNS, part_rows, ["createdAt", "updatedAt"]),
+        "AnatomySynonym": ("anatomy_synonyms.csv", SYNONYM_COLUMNS, synonym_rows_, []),
+    }
+    manifest = {"version": 1, "tables": {}}
+    for table, (filename, columns, rows, _) in tables.items():
+        path = os.path.join(output_dir, filename)
+        write_csv(path, columns, rows)
+        manifest["tables"][table] = {
+            "file": filename,
+            "columns": columns,
+            "rows": len(rows),
+            "sha256": sha256_file(path),
+        }
+    
+    with open(os.path.join(output_dir, "manifest.json"), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    # cd data/bulk && psql -f load.sql
+    # Staging tables keep the CSVs free of timestamps; one INSERT ... SELECT per table
+    lines = ["BEGIN;"]
+    for table, (filename, columns, _, _) in tables.items():
+        staging = f"{table.lower()}_load"
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        lines += [
+            f'CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {column_list} FROM "{table}" WITH NO DATA;',
+            f"\\copy {staging} ({column_list}) FROM '{filename}' WITH (FORMAT csv, HEADER true)",
+        ]
+    lines.append('TRUNCATE "AnatomySynonym", "AnatomyPart";')
+    for table, (_, columns, _, timestamps) in tables.items():
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        insert_list = ", ".join(f'"{c}"' for c in columns + timestamps)
+        select_list = ", ".join([column_list] + ["now()"] * len(timestamps))
+        lines.append(f'INSERT INTO "{table}" ({insert_list}) SELECT {select_list} FROM {table.lower()}_load;')
+    lines.append("COMMIT;")
+    with open(os.path.join(output_dir, "load.sql"), 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    
+    return manifest
+
+def write_bulk_delta(applied, ontology, output_dir):
+    """Diff against the last applied ontology and write upsert CSVs, delta.json and delta.sql
+
+    Parts are matched on partId and synonyms on (partId, synonym, language), the
+    unique keys, so the delta also applies to a database seeded with cuid ids.
+    parentId and AnatomySynonym.partId are resolved through the parent/owner
+    partId after the upsert. lft/rgt/depth are left out of the part comparison:
+    one added part renumbers every interval after it, and those are applied with
+    a single UPDATE ... FROM.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    
+    def synonym_map(parts):
+        return {(part["partId"], row[2], row[3]): row for part in parts for row in synonym_rows(part)}
+    
+    old_parts = {part["partId"]: part_row(part) for part in applied}
+    new_parts = {part["partId"]: part_row(part) for part in ontology}
+    parent_part_ids = {part["partId"]: part.get("parentId") for part in ontology}
+    old_synonyms = synonym_map(applied)
+    new_synonyms = synonym_map(ontology)
+    
+    nested = [PART_COLUMNS.index(c) for c in NESTED_SET_COLUMNS[1:]]
+    
+    def content(row):
+        return [value for i, value in enumerate(row) if i not in nested]
+    
+    def interval(row):
+        return [row[i] for i in nested]
+    
+    added = [pid for pid in new_parts if pid not in old_parts]
+    changed = [pid for pid in new_parts if pid in old_parts and content(old_parts[pid]) != content(new_parts[pid])]
+    removed = [pid for pid in old_parts if pid not in new_parts]
+    synonyms_upserted = [key for key, row in new_synonyms.items() if old_synonyms.get(key) != row]
+    synonyms_removed = [key for key in old_synonyms if key not in new_synonyms]
+    
+    upserted = set(added) | set(changed)
+    renumbered = [pid for pid in new_parts if pid in old_parts and pid not in upserted
+                  and interval(old_parts[pid]) != interval(new_parts[pid])]
+    # parentId/partId columns carry the parent/owner partId, resolved to AnatomyPart.id in delta.sql
+    part_columns = [c for c in PART_COLUMNS if c != "parentId"] + ["parentPartId"]
+    write_csv(os.path.join(output_dir, "delta_parts.csv"), part_columns,
+              [[value for c, value in zip(PART_COLUMNS, row) if c != "parentId"] + [parent_part_ids[pid]]
+               for pid, row in new_parts.items() if pid in upserted])
+    write_csv(os.path.join(output_dir, "delta_nested_set.csv"), ["partId", *NESTED_SET_COLUMNS[1:]],
+              [[pid, *interval(new_parts[pid])] for pid in renumbered])
+    write_csv(os.path.join(output_dir, "delta_synonyms.csv"), SYNONYM_COLUMNS,
+              [[new_synonyms[key][0], *key, new_synonyms[key][4]] for key in synonyms_upserted])
+    
+    delta = {
+        "version": 2,
+        "parts": {"added": added, "changed": changed, "removed": removed, "renumbered": len(renumbered)},
+        "synonyms": {"upserted": len(synonyms_upserted), "removed": [list(key) for key in synonyms_removed]},
+    }
+    with open(os.path.join(output_dir, "delta.json"), 'w') as f:
+        json.dump(delta, f, indent=2)
+    
+    def quote(value):
+        return "'" + str(value).replace("'", "''") + "'"
+    
+    # cd data/bulk && psql -f delta.sql
+    part_list = ", ".join(f'"{c}"' for c in part_columns)
+    upsert_columns = [c for c in part_columns if c != "parentPartId"]
+    upsert_list = ", ".join(f'"{c}"' for c in upsert_columns)
+    part_updates = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in upsert_columns if c not in ("id", "partId"))
+    synonym_list = ", ".join(f'"{c}"' for c in SYNONYM_COLUMNS)
+    nested_columns = ["partId", *NESTED_SET_COLUMNS[1:]]
+    nested_list = ", ".join(f'"{c}"' for c in nested_columns)
+    nested_updates = ", ".join(f'"{c}" = d."{c}"' for c in NESTED_SET_COLUMNS[1:])
+    lines = [
+        "BEGIN;",
+        f'CREATE TEMP TABLE part_delta ON COMMIT DROP AS SELECT {upsert_list}, "partId" AS "parentPartId" '
+        f'FROM "AnatomyPart" WITH NO DATA;',
+        f"\\copy part_delta ({part_list}) FROM 'delta_parts.csv' WITH (FORMAT csv, HEADER true)",
+        f'CREATE TEMP TABLE synonym_delta ON COMMIT DROP AS SELECT {synonym_list} FROM "AnatomySynonym" WITH NO DATA;',
+        f"\\copy synonym_delta ({synonym_list}) FROM 'delta_synonyms.csv' WITH (FORMAT csv, HEADER true)",
+        f'CREATE TEMP TABLE nested_set_delta ON COMMIT DROP AS SELECT {nested_list} FROM "AnatomyPart" WITH NO DATA;',
+        f"\\copy nested_set_delta ({nested_list}) FROM 'delta_nested_set.csv' WITH (FORMAT csv, HEADER true)",
+        # id is only used for new rows, existing rows keep theirs
+        f'INSERT INTO "AnatomyPart" ({upsert_list}, "createdAt", "updatedAt") SELECT {upsert_list}, now(), now() '
+        f'FROM part_delta ON CONFLICT ("partId") DO UPDATE SET {part_updates}, "updatedAt" = now();',
+        'UPDATE "AnatomyPart" AS p SET "parentId" = parent."id" FROM part_delta AS d '
+        'LEFT JOIN "AnatomyPart" AS parent ON parent."partId" = d."parentPartId" WHERE p."partId" = d."partId";',
+        f'UPDATE "AnatomyPart" AS p SET {nested_updates} FROM nested_set_delta AS d WHERE p."partId" = d."partId";',
+    ]
+    if synonyms_removed:
+        keys = ", ".join(f"({', '.join(quote(value) for value in key)})" for key in synonyms_removed)
+        lines.append(f'DELETE FROM "AnatomySynonym" AS s USING "AnatomyPart" AS p WHERE s."partId" = p."id" '
+                     f'AND (p."partId", s."synonym", s."language") IN ({keys});')
+    lines.append('INSERT INTO "AnatomySynonym" ("id", "partId", "synonym", "language", "priority") '
+                 'SELECT d."id", p."id", d."synonym", d."language", d."priority" FROM synonym_delta AS d '
+                 'JOIN "AnatomyPart" AS p ON p."partId" = d."partId" '
+                 'ON CONFLICT ("partId", "synonym", "language") DO UPDATE SET "priority" = EXCLUDED."priority";')
+    if removed:
+        pids = ", ".join(quote(pid) for pid in removed)
+        lines.append(f'DELETE FROM "AnatomyPart" WHERE "partId" IN ({pids});')
+    lines.append("COMMIT;")
+    with open(os.path.join(output_dir, "delta.sql"), 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    
+    return delta
+
+# Persistent partId registry
+# partIds are assigned once per English data-block name (ob.data.name, which
+# OBJECT_OT_translate_atlas never renames) and then never change or get reused,
+# so per-part URLs and cache keys stay valid across atlas rebuilds.
+
+REGISTRY_PATH = os.path.join(DATA_DIR, "z-anatomy-part-ids.json")
+
+def load_part_registry(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            registry = json.load(f)
+    else:
+        registry = {"version": 1, "ids": {}}
+    registry["collisions"] = []
+    registry["taken"] = set(registry["ids"].values())
+    return registry
+
+def register_part_id(registry, key, name):
+    """partId for a registry key; new keys get a normalized id, suffixed on collision"""
+    if key in registry["ids"]:
+        return registry["ids"][key]
+    
+    base = normalize_part_id(name) or "part"
+    part_id = base
+    n = 2
+    while part_id in registry["taken"]:
+        part_id = f"{base}_{n}"
+        n += 1
+    if part_id != base:
+        owner = next(k for k, v in registry["ids"].items() if v == base)
+        registry["collisions"].append({"partId": base, "key": key, "existing": owner, "assigned": part_id})
+    
+    registry["ids"][key] = part_id
+    registry["taken"].add(part_id)
+    return part_id
+
+def save_part_registry(registry, path):
+    with open(path, 'w') as f:
+        json.dump({"version": registry["version"], "ids": dict(sorted(registry["ids"].items()))},
+                  f, indent=2, ensure_ascii=False)
+
+def mesh_content_hash(mesh):
+    """Hash of the mesh geometry, for content-addressed (immutable) asset URLs"""
+    import numpy as np
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loops)
+    digest = hashlib.sha256(co.tobytes())
+    digest.update(loops.tobytes())
+    return digest.hexdigest()[:16]
+
 def extract_ontology():
     """Extract anatomy parts ontology from Z-Anatomy"""
     
     ontology = []
     processed_names = set()
+    translations = load_translations()
     
     print("\n🔍 Extracting Z-Anatomy Ontology")
     print("=" * 70)
@@ -61,92 +468,149 @@ def extract_ontology():
         "8: Visceral systems",
     ]
     
-    for collection_name in main_collections:
-        if collection_name not in bpy.data.collections:
-            continue
-            
-        collection = bpy.data.collections[collection_name]
-        system = determine_system(collection_name, "")
+    object_part_ids = {}   # object name -> partId, to resolve Blender parenting
+    group_part_ids = {}    # partId -> collection partId, fallback parent
+    registry = load_part_registry(REGISTRY_PATH)
+    visited_groups = set()  # collections linked under several parents become one part
+    
+    def add_group(collection, parent_id, system):
+        """Add a part for a (sub-)collection and recurse into its objects and children
+
+        A collection is added under the first parent it is reached from.
+        """
+        if collection.name in visited_groups:
+            return
+        visited_groups.add(collection.name)
+        name = collection_english_name(collection)
+        # a .g group label names the group better than the collection does
+        group_label = next((o for o in collection.objects if o.type == 'FONT' and o.name.endswith('.g')), None)
+        if group_label is not None:
+            name, _ = clean_name(group_label.data.name)
         
-        print(f"\n📦 Processing: {collection_name} ({system})")
+        group_id = register_part_id(registry, f"collection:{collection.get('English', collection.name)}", name)
+        
+        ontology.append({
+            "partId": group_id,
+            "name": name,
+            "system": system,
+            "parentId": parent_id,
+            "modelPath": f"/models/{SYSTEM_PATHS.get(system, 'skeleton/skeleton-full.glb')}",
+            "synonyms": make_synonyms(name, name, translations),
+        })
         
         # Process meshes in collection
         for obj in collection.objects:
             if obj.type != 'MESH' or not obj.name:
                 continue
                 
-            # Skip duplicate names
-            if obj.name in processed_names:
+            # Skip duplicates (objects sharing the same mesh data-block)
+            if obj.data.name in processed_names:
                 continue
                 
-            processed_names.add(obj.name)
+            processed_names.add(obj.data.name)
             
             # Create part entry
-            part_id = normalize_part_id(obj.name)
-            
-            # Generate synonyms
-            synonyms = [
-                {"synonym": obj.name.lower(), "language": "en", "priority": 10}
-            ]
-            
-            # Add common English synonyms
-            if "left" in obj.name.lower():
-                synonyms.append({
-                    "synonym": obj.name.lower().replace("left", "l").replace(".l", ""),
-                    "language": "en",
-                    "priority": 8
-                })
-            elif "right" in obj.name.lower():
-                synonyms.append({
-                    "synonym": obj.name.lower().replace("right", "r").replace(".r", ""),
-                    "language": "en",
-                    "priority": 8
-                })
-            
-            # Determine model path based on system
-            system_paths = {
-                'SKELETAL': 'skeleton/skeleton-full.glb',
-                'MUSCULAR': 'muscular/muscles-full.glb',
-                'CARDIOVASCULAR': 'cardiovascular/cardiovascular-full.glb',
-                'NERVOUS': 'nervous/nervous-full.glb',
-                'RESPIRATORY': 'respiratory/visceral-full.glb',
-                'DIGESTIVE': 'respiratory/visceral-full.glb',
-            }
+            part_id = register_part_id(registry, obj.data.name, obj.data.name)
+            object_part_ids[obj.name] = part_id
+            group_part_ids[part_id] = group_id
             
+            eng_name, _ = clean_name(obj.data.name)
             part_entry = {
                 "partId": part_id,
                 "name": obj.name,
                 "system": system,
-                "modelPath": f"/models/{system_paths.get(system, 'skeleton/skeleton-full.glb')}",
+                "parentId": obj.parent.name if obj.parent else None,  # resolved below
+                "modelPath": f"/models/{SYSTEM_PATHS.get(system, 'skeleton/skeleton-full.glb')}",
                 "meshName": obj.name,  # Store original mesh name for raycasting
-                "synonyms": synonyms
+                "contentHash": mesh_content_hash(obj.data),
+                "synonyms": make_synonyms(obj.name, eng_name, translations)
             }
             
             ontology.append(part_entry)
             
             if len(processed_names) % 100 == 0:
                 print(f"  Processed {len(processed_names)} parts...")
+        
+        for child in collection.children:
+            add_group(child, group_id, system)
+    
+    for collection_name in main_collections:
+        if collection_name not in bpy.data.collections:
+            continue
+            
+        collection = bpy.data.collections[collection_name]
+        system = determine_system(collection_name, "")
+        
+        print(f"\n📦 Processing: {collection_name} ({system})")
+        add_group(collection, None, system)
+    
+    # Blender parenting wins over collection nesting when the parent is a part
+    for part in ontology:
+        if "meshName" in part:
+            part["parentId"] = object_part_ids.get(part["parentId"]) or group_part_ids[part["partId"]]
+    
+    ontology = assign_nested_sets(ontology)
+    
+    save_part_registry(registry, REGISTRY_PATH)
+    print(f"\n🪪 partId registry: {len(registry['ids'])} ids -> {REGISTRY_PATH}")
+    for collision in registry["collisions"]:
+        print(f"  ⚠️  '{collision['key']}' collides with '{collision['existing']}' on "
+              f"{collision['partId']}, assigned {collision['assigned']}")
     
     print(f"\n✅ Extracted {len(ontology)} anatomy parts")
     
     # Save ontology to JSON
-    output_path = "../data/z-anatomy-ontology.json"
+    output_path = os.path.join(DATA_DIR, "z-anatomy-ontology.json")
+    
+    # Delta against what the database last loaded (data/bulk/applied.json, written by
+    # db:load/db:delta/db:seed), so extracting twice before applying never drops a change
+    bulk_dir = os.path.join(DATA_DIR, "bulk")
+    applied_path = os.path.join(bulk_dir, "applied.json")
+    if os.path.exists(applied_path):
+        with open(applied_path) as f:
+            applied = json.load(f)
+        delta = write_bulk_delta(applied, ontology, bulk_dir)
+        print(f"🔀 Delta: +{len(delta['parts']['added'])} ~{len(delta['parts']['changed'])} "
+              f"-{len(delta['parts']['removed'])} parts ({delta['parts']['renumbered']} renumbered), "
+              f"{delta['synonyms']['upserted']} synonym upserts, {len(delta['synonyms']['removed'])} removals")
+    else:
+        # A delta.sql left over from an older base would overwrite newer rows
+        if os.path.exists(os.path.join(bulk_dir, "delta.sql")):
+            os.remove(os.path.join(bulk_dir, "delta.sql"))
+        print(f"⚠️  No {applied_path}, run db:load:z-anatomy once before using db:delta:z-anatomy")
+    
     with open(output_path, 'w') as f:
         json.dump(ontology, f, indent=2)
     
     print(f"💾 Ontology saved to: {output_path}")
     
-    # Generate TypeScript seeding data
-    output_ts_path = "../data/z-anatomy-ontology.ts"
+    # Bulk-load CSVs for seeding (see data/bulk/load.sql)
+    manifest = write_bulk_load(ontology, bulk_dir)
+    # Becomes applied.json once load.sql or delta.sql went through
+    with open(os.path.join(bulk_dir, "pending.json"), 'w') as f:
+        json.dump(ontology, f)
+    for table, info in manifest["tables"].items():
+        print(f"💾 {table}: {info['rows']} rows -> {os.path.join(DATA_DIR, 'bulk', info['file'])}")
+    
+    # Generate thin TypeScript index (partId -> [name, system]); full data lives in the CSVs
+    output_ts_path = os.path.join(DATA_DIR, "z-anatomy-ontology.ts")
     with open(output_ts_path, 'w') as f:
-        f.write("// Auto-generated Z-Anatomy ontology\n")
-        f.write("// Generated from Z-Anatomy Blender file\n\n")
+        f.write("// Auto-generated Z-Anatomy ontology index\n")
+        f.write("// Generated from Z-Anatomy Blender file, seed from data/bulk instead\n\n")
         f.write("import { AnatomySystem } from '../src/types/anatomy';\n\n")
-        f.write("export const zAnatomyOntology = ")
-        f.write(json.dumps(ontology, indent=2))
+        f.write("export const zAnatomyPartIndex: Record<string, [string, AnatomySystem]> = ")
+        f.write(json.dumps({part["partId"]: [part["name"], part["system"]] for part in ontology}, ensure_ascii=False, separators=(',', ':')))
         f.write(";\n")
     
-    print(f"💾 TypeScript data saved to: {output_ts_path}")
+    print(f"💾 TypeScript index saved to: {output_ts_path}")
+    
+    # Save search index for OntologyService / voice command name resolution
+    search_index = build_search_index(ontology)
+    output_index_path = os.path.join(DATA_DIR, "z-anatomy-search-index.json")
+    with open(output_index_path, 'w') as f:
+        json.dump(search_index, f, ensure_ascii=False, separators=(',', ':'))
+    
+    print(f"💾 Search index saved to: {output_index_path} ({len(search_index['terms'])} terms, {len(search_index['trigrams'])} trigrams)")
     
     # Print statistics
     systems = {}
@@ -1,14 +1,82 @@
 #!/usr/bin/env python3
 """
 Inspect Z-Anatomy Blender file structure
-Usage: blender --background Startup.blend --python inspect-blender.py
+Usage: blender --background Startup.blend --python inspect-blender.py [-- --fingerprint <file>]
+
+--fingerprint also writes a content hash of every data-block the pipeline
+reads (meshes, curves, objects, collections, materials, texts, actions), so
+the build (scripts/build-z-anatomy.py) can tell which stages a .blend change affects.
 """
 
 import bpy
+import argparse
+import hashlib
 import json
+import os
+import sys
+from array import array
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_PATH = os.path.join(REPO_ROOT, "public", "models", "z-anatomy-structure.json")
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Inspect Z-Anatomy Blender file structure")
+    parser.add_argument("--fingerprint", default=None,
+                        help="Also write per-data-block content hashes to this file")
+    return parser.parse_args(argv)
+
+def block_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, (bytes, array)) else json.dumps(part, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+def buffer(collection, attribute, typecode, width=1):
+    values = array(typecode, [0]) * (len(collection) * width)
+    collection.foreach_get(attribute, values)
+    return values
+
+def mesh_hash(mesh):
+    return block_hash(buffer(mesh.vertices, 'co', 'f', 3), buffer(mesh.loops, 'vertex_index', 'i'),
+                      buffer(mesh.polygons, 'loop_total', 'i'), buffer(mesh.polygons, 'material_index', 'i'),
+                      [layer.name for layer in mesh.uv_layers], [mat.name if mat else None for mat in mesh.materials])
+
+def curve_hash(curve):
+    points = [[list(point.co) for point in [*spline.points, *spline.bezier_points]] for spline in curve.splines]
+    body = curve.body if isinstance(curve, bpy.types.TextCurve) else None  # label text (FONT objects)
+    return block_hash(points, body, curve.bevel_depth, curve.bevel_resolution, curve.resolution_u)
+
+def object_hash(obj):
+    return block_hash(obj.type, obj.data.name if obj.data else None, [list(row) for row in obj.matrix_world],
+                      obj.parent.name if obj.parent else None, [mod.type for mod in obj.modifiers],
+                      [slot.material.name if slot.material else None for slot in obj.material_slots],
+                      obj.hide_render, obj.hide_viewport)
+
+def action_hash(action):
+    return block_hash([[fc.data_path, fc.array_index, buffer(fc.keyframe_points, 'co', 'f', 2).tolist()]
+                       for fc in action.fcurves])
+
+def write_fingerprint(path):
+    """{data-block type: {name: content hash}} for the data-blocks the pipeline reads"""
+    fingerprint = {
+        "meshes": {mesh.name: mesh_hash(mesh) for mesh in bpy.data.meshes},
+        "curves": {curve.name: curve_hash(curve) for curve in bpy.data.curves},
+        "objects": {obj.name: object_hash(obj) for obj in bpy.data.objects},
+        "collections": {col.name: block_hash(sorted(col.objects.keys()), sorted(col.children.keys()))
+                        for col in bpy.data.collections},
+        "materials": {mat.name: block_hash(list(mat.diffuse_color)) for mat in bpy.data.materials},
+        "texts": {text.name: block_hash(text.as_string()) for text in bpy.data.texts},
+        "actions": {action.name: action_hash(action) for action in bpy.data.actions},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({name: dict(sorted(blocks.items())) for name, blocks in fingerprint.items()}, f, indent=1)
+    print(f"\n🔑 Data-block fingerprint saved to: {path}")
 
 def inspect_blend_file():
     """Inspect the structure of the blend file"""
+    args = parse_args()
     
     report = {
         'collections': [],
@@ -85,10 +153,12 @@ def inspect_blend_file():
         print(f"  ... and {len(bpy.data.materials) - 10} more materials")
     
     # Save report
-    report_path = '../public/models/z-anatomy-structure.json'
-    with open(report_path, 'w') as f:
+    with open(REPORT_PATH, 'w') as f:
         json.dump(report, f, indent=2)
-    print(f"\n💾 Full report saved to: {report_path}")
+    print(f"\n💾 Full report saved to: {REPORT_PATH}")
+    
+    if args.fingerprint:
+        write_fingerprint(args.fingerprint)
     
     # Suggest exports
     print("\n\n💡 Suggested exports based on structure:")
@@ -0,0 +1,157 @@
+#!/usr/bin/env node
+
+/**
+ * Time the client-side geometry decode of a GLB with the decoder the app ships
+ * (public/draco, the one DRACOLoader loads), and print {"decodeMs": ...}
+ *
+ * Draco primitives are decoded to typed arrays the way DRACOLoader's worker does;
+ * other primitives only need their accessors copied out of the binary chunk.
+ * Called by scripts/export-z-anatomy-main-systems.py --dual-codec.
+ *
+ * Usage: node scripts/measure-glb-decode.js <file.glb> [runs]
+ */
+
+import { readFileSync } from "fs";
+import { join, dirname } from "path";
+import { fileURLToPath } from "url";
+import { createRequire } from "module";
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = dirname(__filename);
+
+const dracoDir = join(__dirname, "../public/draco");
+
+const COMPONENT_ARRAYS = {
+  5120: Int8Array,
+  5121: Uint8Array,
+  5122: Int16Array,
+  5123: Uint16Array,
+  5125: Uint32Array,
+  5126: Float32Array,
+};
+const COMPONENT_COUNTS = { SCALAR: 1, VEC2: 2, VEC3: 3, VEC4: 4, MAT4: 16 };
+
+function readGlb(path) {
+  const data = readFileSync(path);
+  if (data.toString("utf8", 0, 4) !== "glTF") {
+    throw new Error(`${path} is not a GLB`);
+  }
+  let json = null;
+  let bin = null;
+  for (let offset = 12; offset < data.length; ) {
+    const length = data.readUInt32LE(offset);
+    const type = data.readUInt32LE(offset + 4);
+    const chunk = data.subarray(offset + 8, offset + 8 + length);
+    if (type === 0x4e4f534a) json = JSON.parse(chunk.toString("utf8"));
+    if (type === 0x004e4942) bin = chunk;
+    offset += 8 + length;
+  }
+  return { json, bin };
+}
+
+// The emscripten wrapper is a classic script, not an ES module
+async function loadDecoder() {
+  const source = readFileSync(join(dracoDir, "draco_wasm_wrapper.js"), "utf8");
+  const module = { exports: {} };
+  new Function("module", "exports", "require", "__dirname", "__filename", source)(
+    module,
+    module.exports,
+    createRequire(import.meta.url),
+    dracoDir,
+    join(dracoDir, "draco_wasm_wrapper.js")
+  );
+  const DracoDecoderModule = module.exports;
+  const wasmBinary = readFileSync(join(dracoDir, "draco_decoder.wasm"));
+  return new Promise((resolve) =>
+    DracoDecoderModule({ wasmBinary }).then((draco) => {
+      // the module is thenable, resolving it directly would loop
+      delete draco.then;
+      resolve(draco);
+    })
+  );
+}
+
+function decodeDraco(draco, bytes, attributes) {
+  const decoder = new draco.Decoder();
+  const mesh = new draco.Mesh();
+  const status = decoder.DecodeArrayToMesh(bytes, bytes.byteLength, mesh);
+  if (!status.ok()) {
+    throw new Error(`Draco decode failed: ${status.error_msg()}`);
+  }
+
+  const indexCount = mesh.num_faces() * 3;
+  const indexPtr = draco._malloc(indexCount * 4);
+  decoder.GetTrianglesUInt32Array(mesh, indexCount * 4, indexPtr);
+  new Uint32Array(draco.HEAPU32.buffer, indexPtr, indexCount).slice();
+  draco._free(indexPtr);
+
+  for (const id of Object.values(attributes)) {
+    const attribute = decoder.GetAttributeByUniqueId(mesh, id);
+    const count = mesh.num_points() * attribute.num_components();
+    const ptr = draco._malloc(count * 4);
+    decoder.GetAttributeDataArrayForAllPoints(mesh, attribute, draco.DT_FLOAT32, count * 4, ptr);
+    new Float32Array(draco.HEAPF32.buffer, ptr, count).slice();
+    draco._free(ptr);
+  }
+
+  draco.destroy(mesh);
+  draco.destroy(decoder);
+}
+
+function copyAccessor(json, bin, index) {
+  const accessor = json.accessors[index];
+  if (accessor.bufferView === undefined) return;
+  const view = json.bufferViews[accessor.bufferView];
+  const ArrayType = COMPONENT_ARRAYS[accessor.componentType];
+  const length = accessor.count * COMPONENT_COUNTS[accessor.type];
+  const start = bin.byteOffset + (view.byteOffset ?? 0) + (accessor.byteOffset ?? 0);
+  // strided (interleaved) views are copied whole, like the loader's interleaved buffers
+  const bytes = view.byteStride ? view.byteLength : length * ArrayType.BYTES_PER_ELEMENT;
+  new Uint8Array(bin.buffer, start, bytes).slice();
+}
+
+function decodeGlb(draco, { json, bin }) {
+  for (const mesh of json.meshes ?? []) {
+    for (const primitive of mesh.primitives) {
+      const compressed = primitive.extensions?.KHR_draco_mesh_compression;
+      if (compressed) {
+        const view = json.bufferViews[compressed.bufferView];
+        const bytes = new Int8Array(bin.buffer, bin.byteOffset + (view.byteOffset ?? 0), view.byteLength);
+        decodeDraco(draco, bytes, compressed.attributes);
+        continue;
+      }
+      for (const index of Object.values(primitive.attributes)) {
+        copyAccessor(json, bin, index);
+      }
+      if (primitive.indices !== undefined) {
+        copyAccessor(json, bin, primitive.indices);
+      }
+    }
+  }
+}
+
+async function main() {
+  const [path, runs = "5"] = process.argv.slice(2);
+  if (!path) {
+    console.error("Usage: node scripts/measure-glb-decode.js <file.glb> [runs]");
+    process.exit(2);
+  }
+  const glb = readGlb(path);
+  const draco = await loadDecoder();
+
+  decodeGlb(draco, glb); // warm up the wasm and the JIT
+  const times = [];
+  for (let i = 0; i < Number(runs); i++) {
+    const start = performance.now();
+    decodeGlb(draco, glb);
+    times.push(performance.now() - start);
+  }
+  times.sort((a, b) => a - b);
+  const median = times[Math.floor(times.length / 2)];
+  console.log(JSON.stringify({ decodeMs: Math.round(median * 10) / 10 }));
+}
+
+main().catch((error) => {
+  console.error(`❌ ${error.message}`);
+  process.exit(1);
+});
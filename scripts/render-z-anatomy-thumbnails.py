@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Render a thumbnail (and optionally an impostor atlas) for every Z-Anatomy part
+Usage: blender --background public/models/Z-Anatomy/Startup.blend --python scripts/render-z-anatomy-thumbnails.py -- [options]
+
+Parts are the meshes in the partId registry (data/z-anatomy-part-ids.json).
+Each render is keyed by a hash of the part's geometry, transform, colour and the
+render settings. Only parts whose hash changed are rendered again, by --workers
+headless Blender processes that load the .blend once and render their share
+with everything but the part hidden. Output goes to public/models/thumbnails
+with a manifest.json (partId -> hash, files).
+"""
+
+import bpy
+import argparse
+import hashlib
+import json
+import math
+import numpy as np
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from mathutils import Vector
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(REPO_ROOT, "public", "models", "thumbnails")
+PART_REGISTRY_PATH = os.path.join(REPO_ROOT, "data", "z-anatomy-part-ids.json")
+
+# Thumbnail camera: anterior (Z-Anatomy faces -Y), slightly from the right and above
+THUMBNAIL_VIEW = Vector((0.35, -1.0, 0.25)).normalized()
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Render Z-Anatomy part thumbnails")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Headless Blender processes rendering in parallel")
+    parser.add_argument("--size", type=int, default=256,
+                        help="Thumbnail size in pixels")
+    parser.add_argument("--engine", choices=["WORKBENCH", "CYCLES"], default="WORKBENCH",
+                        help="Render engine (Cycles runs on the CPU)")
+    parser.add_argument("--impostor-views", type=int, default=0,
+                        help="Also render an atlas of this many views around the part")
+    parser.add_argument("--force", action="store_true",
+                        help="Render every part, even when its hash is unchanged")
+    parser.add_argument("--jobs", default=None,
+                        help=argparse.SUPPRESS)  # worker mode: render the parts listed in this file
+    return parser.parse_args(argv)
+
+def settings_of(args):
+    """Render settings that change the images"""
+    return {"size": args.size, "engine": args.engine, "impostorViews": args.impostor_views}
+
+def render_hash(obj, settings):
+    """Hash of what a part's renders depend on"""
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', co)
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loops)
+    digest = hashlib.sha256(co.tobytes())
+    digest.update(loops.tobytes())
+    digest.update(np.array(obj.matrix_world, dtype=np.float32).tobytes())
+    colors = [list(slot.material.diffuse_color) for slot in obj.material_slots if slot.material]
+    digest.update(json.dumps([colors, settings], sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+def registry_parts():
+    """{partId: mesh object}, the first object using each registered mesh"""
+    with open(PART_REGISTRY_PATH) as f:
+        ids = json.load(f)["ids"]
+    parts = {}
+    for obj in bpy.context.scene.objects:
+        if obj.type == 'MESH' and obj.data.name in ids:
+            parts.setdefault(ids[obj.data.name], obj)
+    return parts
+
+# Worker
+
+def isolate_for_render(scene):
+    """Hide every object from rendering, like hide_wrapper's "hide unselected",
+    with every collection enabled so that unhiding an object shows it"""
+    def enable(layer_collection):
+        layer_collection.exclude = False
+        layer_collection.collection.hide_render = False
+        for child in layer_collection.children:
+            enable(child)
+    enable(bpy.context.view_layer.layer_collection)
+    for ob in scene.objects:
+        if ob.type not in {'LIGHT', 'CAMERA'}:
+            ob.hide_render = True
+
+def setup_render(scene, args):
+    render = scene.render
+    render.engine = 'BLENDER_WORKBENCH' if args.engine == "WORKBENCH" else 'CYCLES'
+    if args.engine == "CYCLES":
+        scene.cycles.device = 'CPU'
+        scene.cycles.samples = 16
+    else:
+        scene.display.shading.light = 'STUDIO'
+        scene.display.shading.color_type = 'MATERIAL'
+    render.resolution_x = render.resolution_y = args.size
+    render.resolution_percentage = 100
+    render.film_transparent = True
+    render.image_settings.file_format = 'PNG'
+    render.image_settings.color_mode = 'RGBA'
+
+    camera = bpy.data.objects.new("Thumbnail camera", bpy.data.cameras.new("Thumbnail camera"))
+    camera.data.type = 'ORTHO'
+    scene.collection.objects.link(camera)
+    scene.camera = camera
+    return camera
+
+def frame(camera, obj, direction):
+    """Point the orthographic camera at obj from direction, filling the frame"""
+    corners = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
+    centre = sum(corners, Vector()) / 8
+    radius = max((corner - centre).length for corner in corners) or 0.01
+    distance = radius * 3
+    camera.location = centre + direction * distance
+    camera.rotation_euler = (-direction).to_track_quat('-Z', 'Y').to_euler()
+    camera.data.ortho_scale = radius * 2.1
+    # clip planes around the part, the 0.1 m default near plane would cut away small parts
+    camera.data.clip_start = distance - radius * 1.5
+    camera.data.clip_end = distance + radius * 1.5
+
+def render_to(scene, path):
+    scene.render.filepath = path
+    bpy.ops.render.render(write_still=True)
+
+def render_impostor(scene, camera, obj, views, path, size):
+    """Render views around the part (azimuth steps) into one horizontal atlas"""
+    atlas = np.zeros((size, size * views, 4), dtype=np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(views):
+            angle = 2 * math.pi * i / views
+            frame(camera, obj, Vector((math.sin(angle), -math.cos(angle), 0.25)).normalized())
+            view_path = os.path.join(tmp, f"{i}.png")
+            render_to(scene, view_path)
+            image = bpy.data.images.load(view_path)
+            pixels = np.empty(size * size * 4, dtype=np.float32)
+            image.pixels.foreach_get(pixels)
+            atlas[:, i * size:(i + 1) * size] = pixels.reshape(size, size, 4)
+            bpy.data.images.remove(image)
+    image = bpy.data.images.new("Impostor atlas", size * views, size, alpha=True)
+    image.pixels.foreach_set(atlas.ravel())
+    image.filepath_raw = path
+    image.file_format = 'PNG'
+    image.save()
+    bpy.data.images.remove(image)
+
+def run_worker(args):
+    with open(args.jobs) as f:
+        jobs = json.load(f)
+    scene = bpy.context.scene
+    isolate_for_render(scene)
+    camera = setup_render(scene, args)
+
+    results = {}
+    for job in jobs["parts"]:
+        start = time.perf_counter()
+        obj = bpy.data.objects[job["object"]]
+        obj.hide_render = False
+        entry = {"hash": job["hash"], "thumbnail": f"{job['partId']}-{job['hash']}.png"}
+        frame(camera, obj, THUMBNAIL_VIEW)
+        render_to(scene, os.path.join(OUTPUT_DIR, entry["thumbnail"]))
+        if args.impostor_views:
+            entry["impostor"] = f"{job['partId']}-{job['hash']}-impostor.png"
+            render_impostor(scene, camera, obj, args.impostor_views,
+                            os.path.join(OUTPUT_DIR, entry["impostor"]), args.size)
+        obj.hide_render = True
+        entry["seconds"] = round(time.perf_counter() - start, 2)
+        results[job["partId"]] = entry
+
+    with open(jobs["results"], 'w') as f:
+        json.dump(results, f)
+
+# Driver
+
+def worker_command(args, jobs_path):
+    return [bpy.app.binary_path, "--background", bpy.data.filepath,
+            "--python", os.path.abspath(__file__), "--",
+            "--jobs", jobs_path, "--size", str(args.size), "--engine", args.engine,
+            "--impostor-views", str(args.impostor_views)]
+
+def render_thumbnails():
+    args = parse_args()
+    if args.jobs:
+        run_worker(args)
+        return
+
+    print("\n🖼️  Rendering Z-Anatomy part thumbnails")
+    print("=" * 70)
+
+    settings = settings_of(args)
+    manifest_path = os.path.join(OUTPUT_DIR, "manifest.json")
+    manifest = {"settings": settings, "parts": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    parts = registry_parts()
+    hashes = {part_id: render_hash(obj, settings) for part_id, obj in parts.items()}
+    stale = [part_id for part_id in sorted(parts)
+             if args.force or manifest["parts"].get(part_id, {}).get("hash") != hashes[part_id]
+             or not os.path.exists(os.path.join(OUTPUT_DIR, manifest["parts"][part_id]["thumbnail"]))]
+    print(f"  {len(parts)} parts, {len(stale)} to render with {args.workers} workers")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        processes = []
+        for worker in range(min(args.workers, len(stale))):
+            chunk = stale[worker::args.workers]
+            jobs_path = os.path.join(tmp, f"jobs-{worker}.json")
+            with open(jobs_path, 'w') as f:
+                json.dump({
+                    "parts": [{"partId": p, "object": parts[p].name, "hash": hashes[p]} for p in chunk],
+                    "results": os.path.join(tmp, f"results-{worker}.json"),
+                }, f)
+            processes.append((worker, jobs_path, subprocess.Popen(
+                worker_command(args, jobs_path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)))
+
+        rendered = {}
+        for worker, jobs_path, process in processes:
+            process.wait()
+            results_path = os.path.join(tmp, f"results-{worker}.json")
+            if process.returncode != 0 or not os.path.exists(results_path):
+                print(f"❌ Worker {worker} failed (exit code {process.returncode})")
+                continue
+            with open(results_path) as f:
+                rendered.update(json.load(f))
+
+    # replace the files of re-rendered parts, drop parts no longer in the registry
+    for part_id, entry in list(manifest["parts"].items()):
+        if part_id in rendered or part_id not in parts:
+            for key in ("thumbnail", "impostor"):
+                path = os.path.join(OUTPUT_DIR, entry.get(key, ""))
+                if entry.get(key) and entry.get(key) != rendered.get(part_id, {}).get(key) and os.path.exists(path):
+                    os.remove(path)
+            del manifest["parts"][part_id]
+    for part_id, entry in rendered.items():
+        manifest["parts"][part_id] = {key: value for key, value in entry.items() if key != "seconds"}
+    manifest["settings"] = settings
+    manifest["parts"] = dict(sorted(manifest["parts"].items()))
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    elapsed = time.perf_counter() - start
+    seconds = [entry["seconds"] for entry in rendered.values()]
+    print(f"\n✅ Rendered {len(rendered)}/{len(stale)} parts in {elapsed:.1f} s"
+          + (f" ({sum(seconds) / len(seconds):.2f} s per part per worker)" if seconds else ""))
+    print(f"📁 {manifest_path}")
+
+if __name__ == "__main__":
+    render_thumbnails()
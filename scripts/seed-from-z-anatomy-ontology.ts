@@ -10,8 +10,12 @@ interface ZAnatomyPart {
   partId: string;
   name: string;
   system: string;
+  parentId?: string | null;
+  lft?: number;
+  rgt?: number;
+  depth?: number;
   modelPath: string;
-  meshName: string;
+  meshName?: string;
   synonyms: Array<{
     synonym: string;
     language: string;
@@ -39,9 +43,11 @@ async function seedFromOntology() {
     console.log("🗑️  Clearing existing data...");
     await prisma.anatomySynonym.deleteMany();
     await prisma.anatomyPart.deleteMany();
+    // The rows below don't match data/bulk/applied.json, db:delta needs a db:load first
+    await fs.rm(path.join(process.cwd(), "data", "bulk", "applied.json"), { force: true });
 
     // Group by system for organized output
-    const bySys: Record<string, ZAnatomyPart[]> = {};
+    const bySystem: Record<string, ZAnatomyPart[]> = {};
     anatomy.forEach((part) => {
       if (!bySystem[part.system]) {
         bySystem[part.system] = [];
@@ -51,6 +57,9 @@ async function seedFromOntology() {
 
     let totalCreated = 0;
     let totalSynonyms = 0;
+    // A parent can belong to another system than its children, so parents are
+    // linked once every system's parts exist
+    const idByPartId = new Map<string, string>();
 
     // Seed each system
     for (const [system, parts] of Object.entries(bySystem)) {
@@ -62,11 +71,15 @@ async function seedFromOntology() {
             partId: partData.partId,
             name: partData.name,
             system: partData.system as any,
+            lft: partData.lft ?? null,
+            rgt: partData.rgt ?? null,
+            depth: partData.depth ?? null,
             modelPath: partData.modelPath,
             lodLevels: null,
             boundingBox: null,
           },
         });
+        idByPartId.set(partData.partId, part.id);
 
         // Create synonyms
         if (partData.synonyms && partData.synonyms.length > 0) {
@@ -89,6 +102,20 @@ async function seedFromOntology() {
       console.log(`✅ ${system}: ${parts.length} parts created`);
     }
 
+    // Link parents
+    console.log("\n🔗 Linking parents...");
+    let totalLinked = 0;
+    for (const partData of anatomy) {
+      const parentId = partData.parentId ? idByPartId.get(partData.parentId) : undefined;
+      if (!parentId) continue;
+      await prisma.anatomyPart.update({
+        where: { id: idByPartId.get(partData.partId)! },
+        data: { parentId },
+      });
+      totalLinked++;
+    }
+    console.log(`✅ ${totalLinked} parts linked to their parent`);
+
     console.log("\n✨ Seeding completed successfully!");
     console.log(`📊 Total parts: ${totalCreated}`);
     console.log(`📊 Total synonyms: ${totalSynonyms}`);
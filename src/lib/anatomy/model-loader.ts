@@ -1,9 +1,14 @@
 // Z-Anatomy GLTF/GLB Model Loader with LOD support
 
 import * as THREE from "three";
-import { GLTFLoader } from "three-stdlib";
+import { DRACOLoader, GLTFLoader } from "three-stdlib";
 import type { GLTF } from "three-stdlib";
 import type { LODLevels, BoundingBox } from "@/types/anatomy";
+import { detectPlatform } from "@/lib/platform-detect";
+import {
+  detectNetworkSpeed,
+  estimateDownloadTime,
+} from "@/lib/network-detection";
 
 interface LoadedModel {
   scene: THREE.Group;
@@ -11,6 +16,21 @@ interface LoadedModel {
   boundingBox: BoundingBox;
 }
 
+// Written next to each GLB by scripts/export-z-anatomy-main-systems.py --dual-codec
+interface ModelVariant {
+  file: string;
+  bytes: number;
+  decodeMs?: number; // Draco wasm decode in node on the export machine, absent without node
+  extensions: string[];
+}
+
+interface ModelManifest {
+  variants?: Record<string, ModelVariant>;
+}
+
+// Same decoder as the measurement, slower on phones and tablets than on the export machine
+const DECODE_SLOWDOWN = { desktop: 1, tablet: 3, mobile: 5 };
+
 interface ModelCache {
   [key: string]: {
     high?: LoadedModel;
@@ -23,11 +43,16 @@ export class AnatomyModelLoader {
   private loader: GLTFLoader;
   private cache: ModelCache = {};
   private loadingManager: THREE.LoadingManager;
+  private variants = new Map<string, Promise<string>>();
 
   constructor() {
     this.loadingManager = new THREE.LoadingManager();
     this.loader = new GLTFLoader(this.loadingManager);
 
+    const dracoLoader = new DRACOLoader();
+    dracoLoader.setDecoderPath("/draco/");
+    this.loader.setDRACOLoader(dracoLoader);
+
     this.setupLoadingManager();
   }
 
@@ -139,13 +164,47 @@ export class AnatomyModelLoader {
     return lod;
   }
 
+  /**
+   * Pick the variant with the lowest estimated download + decode time
+   * for this device, falling back to the path itself without a manifest
+   */
+  private resolveVariant(path: string): Promise<string> {
+    if (!this.variants.has(path)) {
+      this.variants.set(path, this.fetchVariant(path));
+    }
+    return this.variants.get(path)!;
+  }
+
+  private async fetchVariant(path: string): Promise<string> {
+    try {
+      const response = await fetch(path.replace(/\.glb$/, ".manifest.json"));
+      if (!response.ok) return path;
+      const manifest: ModelManifest = await response.json();
+      if (!manifest.variants) return path;
+
+      const speed = detectNetworkSpeed();
+      const slowdown = DECODE_SLOWDOWN[detectPlatform()];
+      const cost = (variant: ModelVariant) =>
+        estimateDownloadTime(variant.bytes / (1024 * 1024), speed) +
+        ((variant.decodeMs ?? 0) * slowdown) / 1000;
+
+      const [best] = Object.values(manifest.variants).sort(
+        (a, b) => cost(a) - cost(b)
+      );
+      return path.slice(0, path.lastIndexOf("/") + 1) + best.file;
+    } catch {
+      return path;
+    }
+  }
+
   /**
    * Load GLTF file
    */
   private async loadGLTF(path: string): Promise<GLTF> {
+    const url = await this.resolveVariant(path);
     return new Promise((resolve, reject) => {
       this.loader.load(
-        path,
+        url,
         (gltf) => resolve(gltf),
         undefined,
         (error) => reject(error)
@@ -0,0 +1,55 @@
+"""Load the Blender scripts under scripts/ without Blender
+
+Only the pure functions are tested here. bpy, bmesh and mathutils are replaced
+by empty modules so that the scripts import; anything calling into them needs
+Blender and is not covered.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "scripts")
+
+
+class _Matrix:
+    @staticmethod
+    def Scale(*args):
+        return None
+
+
+def _blender_modules():
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Matrix = _Matrix
+    mathutils.Vector = tuple
+    bvhtree = types.ModuleType("mathutils.bvhtree")
+    bvhtree.BVHTree = object
+    kdtree = types.ModuleType("mathutils.kdtree")
+    kdtree.KDTree = object
+    mathutils.bvhtree = bvhtree
+    mathutils.kdtree = kdtree
+    return {
+        "bpy": types.ModuleType("bpy"),
+        "bmesh": types.ModuleType("bmesh"),
+        "mathutils": mathutils,
+        "mathutils.bvhtree": bvhtree,
+        "mathutils.kdtree": kdtree,
+    }
+
+
+@pytest.fixture
+def load_script(monkeypatch):
+    """Import scripts/<name>.py as a module"""
+    for name, module in _blender_modules().items():
+        monkeypatch.setitem(sys.modules, name, module)
+
+    def load(name):
+        spec = importlib.util.spec_from_file_location(name.replace("-", "_"), os.path.join(SCRIPTS_DIR, name + ".py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
@@ -0,0 +1,99 @@
+import argparse
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+# Stands in for Blender: answers the worker protocol, dies on a job named "crash"
+# and refuses to start once the "broken" file exists next to it
+STUB_BLENDER = textwrap.dedent("""\
+    #!{python}
+    import json, os, sys
+    here = os.path.dirname(os.path.abspath(__file__))
+    if os.path.exists(os.path.join(here, "broken")):
+        sys.exit(3)
+    print('@@pool ' + json.dumps({{"event": "ready"}}), flush=True)
+    for line in sys.stdin:
+        job = json.loads(line)
+        if job["name"] == "crash":
+            sys.exit(1)
+        print("Blender output", flush=True)
+        print('@@pool ' + json.dumps({{"event": "result", "status": 0, "output": job["name"],
+                                       "removed": 0, "runSeconds": 0.1, "resetSeconds": 0.01}}), flush=True)
+""")
+
+
+@pytest.fixture
+def pool_module(load_script):
+    return load_script("blender-worker-pool")
+
+
+@pytest.fixture
+def stub_blender(tmp_path):
+    path = tmp_path / "blender"
+    path.write_text(STUB_BLENDER.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+@pytest.fixture
+def make_pool(pool_module, stub_blender, tmp_path):
+    pools = []
+
+    def make(workers=1, blend="Startup.blend"):
+        args = argparse.Namespace(blender=str(stub_blender), blend=str(tmp_path / blend), workers=workers)
+        pool = pool_module.Pool(args)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        for worker in filter(None, pool.workers):
+            worker.process.kill()
+            worker.process.wait()
+
+
+def job(name, script="scripts/inspect-blender.py"):
+    return {"name": name, "script": script, "args": [], "cwd": os.getcwd(), "reset": "revert"}
+
+
+def test_submit_runs_on_an_idle_worker(make_pool):
+    pool = make_pool(workers=2)
+    result = pool.submit(job("inspect"))
+    assert result["status"] == 0
+    assert result["output"] == "inspect"
+    assert result["worker"] in (0, 1)
+    assert pool.idle.qsize() == 2
+
+
+def test_crashed_worker_is_restarted(make_pool):
+    pool = make_pool()
+    crashed = pool.workers[0]
+    result = pool.submit(job("crash"))
+    assert result["status"] == 1
+    assert pool.workers[0] is not crashed
+    assert pool.submit(job("inspect"))["status"] == 0
+
+
+def test_worker_that_cannot_restart_is_dropped(make_pool, tmp_path):
+    pool = make_pool()
+    (tmp_path / "broken").touch()
+    result = pool.submit(job("crash"))
+    assert result["status"] == 1
+    assert pool.workers == [None]
+    assert pool.status()["workers"] == []
+    assert "error" in pool.submit(job("inspect"))
+
+
+def test_job_needing_another_blend_is_refused(make_pool):
+    pool = make_pool()
+    result = pool.submit(job("lite", script="scripts/build-z-anatomy-lite.py"))
+    assert "Z-Anatomy.blend" in result["error"]
+    assert pool.idle.qsize() == 1
+
+
+def test_job_on_its_own_blend_runs(make_pool):
+    pool = make_pool(blend="Z-Anatomy.blend")
+    assert pool.submit(job("lite", script="scripts/build-z-anatomy-lite.py"))["status"] == 0
@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def build(load_script, tmp_path, monkeypatch):
+    module = load_script("build-z-anatomy")
+    monkeypatch.setattr(module, "REPO_ROOT", str(tmp_path))
+    monkeypatch.setattr(module, "BUILD_DIR", str(tmp_path / ".build"))
+    monkeypatch.setattr(module, "STATE_PATH", str(tmp_path / ".build" / "state.json"))
+    return module
+
+
+@pytest.fixture
+def stages(build, tmp_path):
+    args = argparse.Namespace(blend=str(tmp_path / "Startup.blend"), export_args=[])
+    return {stage.name: stage for stage in build.link_stages(build.define_stages(args))}
+
+
+def write(root, path, content):
+    path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content if isinstance(content, str) else json.dumps(content))
+
+
+def test_stages_run_after_their_dependencies(build, tmp_path):
+    args = argparse.Namespace(blend=str(tmp_path / "Startup.blend"), export_args=[])
+    ordered = [stage.name for stage in build.link_stages(build.define_stages(args))]
+    assert ordered == ["inspect", "ontology", "export", "lod", "manifest"]
+
+
+def test_stage_dependencies(stages):
+    assert stages["inspect"].deps == set()
+    assert stages["ontology"].deps == {"inspect"}
+    assert stages["export"].deps == {"inspect", "ontology"}
+    # lod shares the Draco settings with export and must not run next to it
+    assert stages["lod"].deps == {"inspect", "ontology", "export"}
+    assert stages["manifest"].deps == {"export", "lod"}
+
+
+def test_dependency_cycle_is_an_error(build):
+    a = build.Stage("a", ["b.out"], outputs=["a.out"])
+    b = build.Stage("b", ["a.out"], outputs=["b.out"])
+    with pytest.raises(SystemExit):
+        build.link_stages([a, b])
+
+
+def test_select_pulls_in_dependencies(build, stages):
+    selected = build.select(list(stages.values()), ["ontology"])
+    assert [stage.name for stage in selected] == ["inspect", "ontology"]
+    with pytest.raises(SystemExit):
+        build.select(list(stages.values()), ["nope"])
+
+
+def test_stage_key_follows_only_the_blocks_a_stage_reads(build, stages, tmp_path):
+    state = build.State()
+    fingerprint = {"meshes": {"a": 1}, "objects": {}, "collections": {}, "texts": {"t": 1},
+                   "curves": {}, "materials": {}}
+    write(tmp_path, build.FINGERPRINT, fingerprint)
+    ontology = build.stage_key(stages["ontology"], state)
+    export = build.stage_key(stages["export"], state)
+
+    # texts feed the ontology (labels) but not the geometry
+    write(tmp_path, build.FINGERPRINT, {**fingerprint, "texts": {"t": 2}})
+    assert build.stage_key(stages["ontology"], state) != ontology
+    assert build.stage_key(stages["export"], state) == export
+
+    write(tmp_path, build.FINGERPRINT, {**fingerprint, "materials": {"m": 1}})
+    assert build.stage_key(stages["ontology"], state) == ontology
+    assert build.stage_key(stages["export"], state) != export
+
+
+def test_stage_key_follows_input_files_and_args(build, tmp_path):
+    state = build.State()
+    write(tmp_path, "in/a.txt", "one")
+    stage = build.Stage("s", ["in/*.txt"], outputs=["out.txt"], script="s.py", args=["--x"])
+    key = build.stage_key(stage, state)
+    assert build.stage_key(stage, state) == key
+
+    write(tmp_path, "in/b.txt", "two")
+    with_file = build.stage_key(stage, state)
+    assert with_file != key
+
+    stage.args = ["--y"]
+    assert build.stage_key(stage, state) != with_file
+
+
+def test_file_hash_is_cached_by_size_and_mtime(build, tmp_path):
+    state = build.State()
+    write(tmp_path, "f.txt", "abc")
+    path = str(tmp_path / "f.txt")
+    first = state.file_hash(path)
+    assert state.data["files"]["f.txt"][2] == first
+
+    write(tmp_path, "f.txt", "abcd")
+    assert state.file_hash(path) != first
+
+
+def test_missing_inputs_hash_to_none(build):
+    assert build.State().pattern_hash("nothing/*.json") is None
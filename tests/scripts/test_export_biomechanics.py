@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def biomechanics(load_script):
+    return load_script("export-z-anatomy-biomechanics")
+
+
+def test_reduce_keys_of_a_line_keeps_the_ends(biomechanics):
+    values = np.linspace(0, 1, 50)[:, None] * np.array([1.0, -2.0, 0.5])
+    assert list(biomechanics.reduce_keys(values, 1e-6)) == [0, 49]
+
+
+def test_reduce_keys_keeps_a_corner(biomechanics):
+    values = np.concatenate([np.linspace(0, 1, 11), np.linspace(1, 0, 11)[1:]])[:, None]
+    assert list(biomechanics.reduce_keys(values, 1e-6)) == [0, 10, 20]
+
+
+@pytest.mark.parametrize("tolerance", [0.1, 0.01, 0.001])
+def test_reduce_keys_stays_within_tolerance(biomechanics, tolerance):
+    frames = np.arange(120)
+    values = np.stack([np.sin(frames / 9), np.cos(frames / 13), np.sin(frames / 5) * 0.1], axis=1)
+    keys = biomechanics.reduce_keys(values, tolerance)
+    assert keys[0] == 0 and keys[-1] == len(values) - 1
+    assert np.all(np.diff(keys) > 0)
+    assert biomechanics.reconstruction_error(values, keys) <= tolerance
+
+
+def test_reduce_keys_fewer_keys_for_looser_tolerance(biomechanics):
+    frames = np.arange(200)
+    values = np.sin(frames / 10)[:, None]
+    assert len(biomechanics.reduce_keys(values, 0.05)) < len(biomechanics.reduce_keys(values, 0.001))
+
+
+def test_reduce_keys_of_two_frames(biomechanics):
+    values = np.array([[0.0], [5.0]])
+    assert list(biomechanics.reduce_keys(values, 0.0)) == [0, 1]
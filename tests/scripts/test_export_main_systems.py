@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def export(load_script):
+    return load_script("export-z-anatomy-main-systems")
+
+
+class FakeVertices:
+    def __init__(self, co):
+        self.co = np.asarray(co, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.co)
+
+    def foreach_get(self, attribute, out):
+        out[:] = self.co.ravel()
+
+
+class FakeObject:
+    """The parts of a mesh object quantization_error reads"""
+
+    def __init__(self, co, scale=1.0):
+        self.data = type("Mesh", (), {"vertices": FakeVertices(co)})()
+        self.matrix_world = np.diag([scale, scale, scale, 1.0])
+
+
+def cloud(n=500, seed=0, extent=0.2):
+    return np.random.default_rng(seed).random((n, 3)) * extent
+
+
+def test_morton_order_is_a_permutation(export):
+    points = cloud()
+    order = export.morton_order(points)
+    assert sorted(order) == list(range(len(points)))
+
+
+def test_morton_order_keeps_neighbours_together(export):
+    # two tight clusters far apart stay contiguous in the order
+    rng = np.random.default_rng(1)
+    points = np.concatenate([rng.random((50, 3)) * 0.01, 1.0 + rng.random((50, 3)) * 0.01])
+    rng.shuffle(points)
+    order = export.morton_order(points)
+    near = points[order, 0] < 0.5
+    assert (np.diff(near.astype(int)) != 0).sum() == 1
+
+
+def test_morton_order_of_identical_points(export):
+    points = np.ones((4, 3))
+    assert list(export.morton_order(points)) == [0, 1, 2, 3]
+
+
+def test_quantization_error_within_half_a_step(export):
+    co = cloud()
+    extent = (co.max(axis=0) - co.min(axis=0)).max()
+    for bits in export.POSITION_BITS:
+        step = extent / (2 ** bits - 1)
+        error = export.quantization_error([FakeObject(co)], bits)
+        assert 0 < error <= step / 2 * math.sqrt(3) + 1e-12
+
+
+def test_quantization_error_follows_the_world_scale(export):
+    co = cloud()
+    local = export.quantization_error([FakeObject(co)], 10)
+    assert export.quantization_error([FakeObject(co, scale=3.0)], 10) == pytest.approx(3 * local)
+
+
+def test_quantization_error_ignores_empty_and_flat_objects(export):
+    objects = [FakeObject(np.empty((0, 3))), FakeObject(np.zeros((3, 3)))]
+    assert export.quantization_error(objects, 8) == 0.0
+
+
+def test_search_position_bits_picks_the_fewest_within_budget(export):
+    objects = [FakeObject(cloud())]
+    budget = 0.0001
+    bits, error = export.search_position_bits(objects, budget)
+    assert error <= budget
+    assert bits == min(export.POSITION_BITS) or export.quantization_error(objects, bits - 1) > budget
+
+
+def test_search_position_bits_bounds(export):
+    objects = [FakeObject(cloud())]
+    assert export.search_position_bits(objects, 1.0)[0] == min(export.POSITION_BITS)
+    # an unreachable budget falls back to the most bits, with its (too large) error
+    bits, error = export.search_position_bits(objects, 0.0)
+    assert bits == max(export.POSITION_BITS)
+    assert error == export.quantization_error(objects, bits) > 0
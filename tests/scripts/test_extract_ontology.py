@@ -0,0 +1,104 @@
+import csv
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture
+def ontology(load_script):
+    return load_script("extract-z-anatomy-ontology")
+
+
+def part(part_id, parent=None, name=None, synonyms=()):
+    return {
+        "partId": part_id,
+        "name": name or part_id,
+        "system": "SKELETAL",
+        "parentId": parent,
+        "modelPath": "/models/skeleton/skeleton-full.glb",
+        "synonyms": [{"synonym": s, "language": "en", "priority": 9} for s in synonyms],
+    }
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_nested_sets_depth_first(ontology):
+    parts = ontology.assign_nested_sets([
+        part("hand", "arm"), part("arm"), part("finger", "hand"), part("leg"),
+    ])
+    intervals = {p["partId"]: (p["lft"], p["rgt"], p["depth"]) for p in parts}
+    assert [p["partId"] for p in parts] == ["arm", "hand", "finger", "leg"]
+    assert intervals == {"arm": (1, 6, 0), "hand": (2, 5, 1), "finger": (3, 4, 2), "leg": (7, 8, 0)}
+
+
+def test_nested_sets_subtree_is_an_interval(ontology):
+    parts = ontology.assign_nested_sets([
+        part("a"), part("b", "a"), part("c", "b"), part("d", "a"), part("e"),
+    ])
+    by_id = {p["partId"]: p for p in parts}
+    subtree = {p["partId"] for p in parts if by_id["a"]["lft"] < p["lft"] and p["rgt"] < by_id["a"]["rgt"]}
+    assert subtree == {"b", "c", "d"}
+
+
+def test_nested_sets_skip_unreachable_and_duplicate_ids(ontology):
+    parts = ontology.assign_nested_sets([part("a"), part("a"), part("orphan", "missing")])
+    assert [p["partId"] for p in parts] == ["a"]
+    assert (parts[0]["lft"], parts[0]["rgt"]) == (1, 2)
+
+
+def test_delta_classifies_parts_and_synonyms(ontology, tmp_path):
+    applied = ontology.assign_nested_sets([
+        part("a"), part("b", "a", synonyms=["bee", "old"]), part("c", "a"), part("gone", "a"),
+    ])
+    current = ontology.assign_nested_sets([
+        part("a"), part("new", "a"), part("b", "a", name="B", synonyms=["bee"]), part("c", "a"),
+    ])
+    delta = ontology.write_bulk_delta(applied, current, str(tmp_path))
+
+    assert delta["parts"]["added"] == ["new"]
+    assert delta["parts"]["changed"] == ["b"]
+    assert delta["parts"]["removed"] == ["gone"]
+    assert delta["synonyms"] == {"upserted": 0, "removed": [["b", "old", "en"]]}
+    with open(tmp_path / "delta.json") as f:
+        assert json.load(f) == delta
+
+
+def test_delta_keeps_renumbered_parts_out_of_the_upsert(ontology, tmp_path):
+    applied = ontology.assign_nested_sets([part("a"), part("b", "a"), part("c", "a")])
+    current = ontology.assign_nested_sets([part("a"), part("new", "a"), part("b", "a"), part("c", "a")])
+    delta = ontology.write_bulk_delta(applied, current, str(tmp_path))
+
+    upserted = read_csv(tmp_path / "delta_parts.csv")
+    assert [row["partId"] for row in upserted] == ["new"]
+    assert upserted[0]["parentPartId"] == "a"
+    renumbered = read_csv(tmp_path / "delta_nested_set.csv")
+    assert {row["partId"] for row in renumbered} == {"a", "b", "c"}
+    assert delta["parts"]["renumbered"] == 3
+
+
+def test_delta_of_an_unchanged_ontology_is_empty(ontology, tmp_path):
+    parts = ontology.assign_nested_sets([part("a", synonyms=["x"]), part("b", "a")])
+    delta = ontology.write_bulk_delta(parts, parts, str(tmp_path))
+
+    assert delta["parts"] == {"added": [], "changed": [], "removed": [], "renumbered": 0}
+    assert delta["synonyms"] == {"upserted": 0, "removed": []}
+    for name in ("delta_parts.csv", "delta_nested_set.csv", "delta_synonyms.csv"):
+        assert read_csv(tmp_path / name) == []
+
+
+def test_delta_sql_matches_on_part_id(ontology, tmp_path):
+    applied = ontology.assign_nested_sets([part("a"), part("o'brien", "a", synonyms=["it's"])])
+    current = ontology.assign_nested_sets([part("a")])
+    ontology.write_bulk_delta(applied, current, str(tmp_path))
+
+    with open(tmp_path / "delta.sql") as f:
+        sql = f.read()
+    assert 'ON CONFLICT ("partId") DO UPDATE' in sql
+    assert 'ON CONFLICT ("partId", "synonym", "language") DO UPDATE' in sql
+    assert """IN (('o''brien', 'it''s', 'en'))""" in sql
+    assert """DELETE FROM "AnatomyPart" WHERE "partId" IN ('o''brien');""" in sql
+    assert sql.startswith("BEGIN;") and sql.rstrip().endswith("COMMIT;")